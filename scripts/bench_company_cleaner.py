@@ -0,0 +1,109 @@
+import csv
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+
+import naukri_jobs_cleaner as cleaner
+
+SYNTHETIC_CSV = "fixtures/naukri_jobs_synthetic.csv"
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+DISTINCT_COMPANIES = 20000  # real exports repeat the same employers a lot
+SEED = 7
+
+def legacy_clean_company_name(company_raw, job_title=None):
+    """The original loop of ~50 re.sub calls, kept as the golden reference."""
+    if not company_raw:
+        return "Unknown"
+
+    text = company_raw.strip()
+
+    if job_title:
+        text = re.sub(re.escape(job_title), "", text, flags=re.IGNORECASE)
+
+    for kw in cleaner.JUNK_KEYWORDS:
+        text = re.sub(rf"\b{kw}\b", "", text, flags=re.IGNORECASE)
+
+    for city in cleaner.CITY_PATTERNS:
+        text = re.sub(rf"\b{re.escape(city)}\b", "", text, flags=re.IGNORECASE)
+
+    for frag in cleaner.LEFTOVER_FRAGMENTS:
+        text = re.sub(rf"\b{frag}\b", "", text, flags=re.IGNORECASE)
+
+    text = re.sub(r"\b\d+\s*To\s*(\d+)?\b", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\(.*?\)", "", text)
+    text = re.sub(r"\s*-\s*.*$", "", text)
+    text = re.sub(r"\s{2,}", " ", text).strip()
+
+    return text if text else "Unknown"
+
+def random_company(rng, vocab):
+    words = []
+    for _ in range(rng.randint(1, 7)):
+        word = rng.choice(vocab)
+        word = rng.choice([word, word.lower(), word.upper()])
+        sep = rng.choice([" ", " ", " ", "  ", "/", " / ", "-", " - ", ",", "", "(", ")", " ("])
+        words.append(word + sep)
+    return "".join(words).strip(rng.choice(["", " "]))
+
+def generate_csv(path, rows, seed=SEED):
+    """Synthetic Naukri export mixing real keywords/cities with company-ish words, dashes, brackets and ranges."""
+    rng = random.Random(seed)
+    vocab = (
+        cleaner.JUNK_KEYWORDS + cleaner.CITY_PATTERNS + cleaner.LEFTOVER_FRAGMENTS
+        + ["Infotech", "Solutions", "Pvt", "Ltd", "Technologies", "Tata", "Consultancy", "Services", "Global",
+           "Navi", "Mumbaikar", "Salesforce", "Telesales", "3 To 5", "10to", "Yrs", "Ncr", "Delhi", "Café", "ünicode"]
+    )
+    titles = ["Sales Executive", "Software Engineer", "Telesales (Hindi)", "Lead Generation - Voice", "", "C++ Developer", "BPO"]
+    companies = [random_company(rng, vocab) for _ in range(DISTINCT_COMPANIES)]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "company", "location", "link"])
+        for i in range(rows):
+            title = rng.choice(titles)
+            company = rng.choice(companies)
+            if title and rng.random() < 0.2:
+                company = f"{company} {title}"
+            location = rng.choice(["Mumbai", "Pune (Hybrid)", "Delhi,  , Noida", "", "Bengaluru  (Remote)"])
+            writer.writerow([title, company, location, f"https://www.naukri.com/job-listings-{i}"])
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def timed_clean(output_path, clean_company):
+    start = time.perf_counter()
+    cleaner.clean_csv(SYNTHETIC_CSV, output_path, clean_company)
+    return time.perf_counter() - start
+
+def main():
+    if not os.path.exists(SYNTHETIC_CSV) or "--regenerate" in sys.argv:
+        print(f"🧪 Generating {ROWS:,} synthetic rows in {SYNTHETIC_CSV}")
+        generate_csv(SYNTHETIC_CSV, ROWS)
+
+    legacy_out = SYNTHETIC_CSV.replace(".csv", "_legacy.csv")
+    fast_out = SYNTHETIC_CSV.replace(".csv", "_fast.csv")
+    columnar_out = SYNTHETIC_CSV.replace(".csv", "_columnar.csv")
+    cleaner.clean_company_name.cache_clear()
+    cleaner.clean_location.cache_clear()
+    legacy_secs = timed_clean(legacy_out, legacy_clean_company_name)
+    fast_secs = timed_clean(fast_out, cleaner.clean_company_name)
+    start = time.perf_counter()
+    cleaner.clean_csv_columnar(SYNTHETIC_CSV, columnar_out)
+    columnar_secs = time.perf_counter() - start
+
+    print(f"🐢 re.sub loop:       {legacy_secs:.2f}s")
+    print(f"🚀 compiled + cached: {fast_secs:.2f}s ({legacy_secs / fast_secs:.1f}x)")
+    print(f"📊 columnar chunks:   {columnar_secs:.2f}s ({legacy_secs / columnar_secs:.1f}x, {cleaner.CLEAN_WORKERS} worker(s))")
+    print(f"💾 {cleaner.clean_company_name.cache_info()}")
+    if file_digest(legacy_out) == file_digest(fast_out) == file_digest(columnar_out):
+        print("✅ Outputs are byte-identical")
+    else:
+        print("❌ Outputs differ")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import glob
+import os
+import time
+import tracemalloc
+
+from html_scan import LinkedInLinkScanner, CompanySizeScanner, scan_text
+from linkedin_search import find_linkedin_links, parse_company_size
+
+CORPUS_DIR = "fixtures/pages"  # saved company websites and LinkedIn company pages (*.html)
+ROUNDS = 5
+
+def soup_path(html):
+    links = find_linkedin_links(html)
+    return links[:1], parse_company_size(html)
+
+def fast_path(html):
+    return scan_text(html, LinkedInLinkScanner(1)), scan_text(html, CompanySizeScanner())
+
+def measure(extract, pages):
+    """Seconds per page and peak traced memory (KB) for running extract over the corpus."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for html in pages:
+            extract(html)
+    elapsed = (time.perf_counter() - start) / (ROUNDS * len(pages))
+
+    peak = 0
+    for html in pages:
+        tracemalloc.start()
+        extract(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return elapsed, peak / 1024
+
+def main():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*.html"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    if not pages:
+        print(f"❌ No saved pages found in {CORPUS_DIR}")
+        return
+
+    mismatches = sum(soup_path(html) != fast_path(html) for html in pages)
+    soup_secs, soup_peak = measure(soup_path, pages)
+    fast_secs, fast_peak = measure(fast_path, pages)
+
+    print(f"📂 {len(pages)} pages, {sum(map(len, pages)) / 1024:.0f} KB of HTML")
+    print(f"{'path':<15}{'ms / page':>12}{'peak KB':>12}")
+    print(f"{'beautifulsoup':<15}{soup_secs * 1000:>12.2f}{soup_peak:>12.0f}")
+    print(f"{'streaming':<15}{fast_secs * 1000:>12.2f}{fast_peak:>12.0f}")
+    if mismatches:
+        print(f"⚠️ {mismatches} pages gave different results")
+    else:
+        print("✅ Both paths agree on every page")
+
+if __name__ == "__main__":
+    main()
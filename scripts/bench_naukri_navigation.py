@@ -0,0 +1,89 @@
+import asyncio
+import functools
+import glob
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from scrape_naukri import LISTING_SELECTOR, LISTING_TIMEOUT_MS, block_heavy_resources
+
+FIXTURE_DIR = "fixtures/naukri"  # listing pages saved with "Save page as… (complete)"
+PORT = 8765
+ROUNDS = 3
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def start_fixture_server():
+    handler = functools.partial(QuietHandler, directory=FIXTURE_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", PORT), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def load_legacy(page, url):
+    await page.goto(url, wait_until="networkidle")
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    await asyncio.sleep(2)
+
+async def load_light(page, url):
+    await page.goto(url, wait_until="domcontentloaded")
+    try:
+        await page.wait_for_selector(LISTING_SELECTOR, timeout=LISTING_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+async def measure(browser, urls, loader, block):
+    """Return (total bytes received, seconds per page) for loading every url ROUNDS times."""
+    context = await browser.new_context()
+    if block:
+        await context.route("**/*", block_heavy_resources)
+    page = await context.new_page()
+
+    received = []
+
+    async def on_finished(request):
+        sizes = await request.sizes()
+        received.append(sizes["responseHeadersSize"] + sizes["responseBodySize"])
+
+    page.on("requestfinished", on_finished)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for url in urls:
+            await loader(page, url)
+    elapsed = time.perf_counter() - start
+
+    await context.close()
+    return sum(received), elapsed / (ROUNDS * len(urls))
+
+async def main():
+    files = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not files:
+        print(f"❌ No fixture pages found in {FIXTURE_DIR}")
+        return
+
+    server = start_fixture_server()
+    urls = [f"http://127.0.0.1:{PORT}/{os.path.basename(f)}" for f in files]
+    print(f"📂 Benchmarking {len(urls)} fixture pages × {ROUNDS} rounds")
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        legacy_bytes, legacy_secs = await measure(browser, urls, load_legacy, block=False)
+        light_bytes, light_secs = await measure(browser, urls, load_light, block=True)
+        await browser.close()
+
+    server.shutdown()
+
+    print(f"{'mode':<10}{'KB transferred':>16}{'s / page':>12}")
+    print(f"{'legacy':<10}{legacy_bytes / 1024:>16.1f}{legacy_secs:>12.2f}")
+    print(f"{'light':<10}{light_bytes / 1024:>16.1f}{light_secs:>12.2f}")
+    if legacy_bytes and legacy_secs:
+        print(f"✅ {100 * (1 - light_bytes / legacy_bytes):.0f}% fewer bytes, "
+              f"{legacy_secs / light_secs:.1f}× faster per page")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+import json
+import os
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import profiles_companies_merger as merger
+
+FIXTURE_DIR = "fixtures/merge"
+PROFILES = int(os.getenv("BENCH_PROFILES", "1000000"))
+COMPANIES = int(os.getenv("BENCH_COMPANIES", "50000"))
+SEED = 11
+
+def legacy_merge(profiles_path, companies_path, json_path, csv_path):
+    """The original dict + Python loop merge, kept as the baseline."""
+    profiles = merger.load_json(profiles_path)
+    companies = merger.load_json(companies_path)
+    company_map = {
+        c.get("company_name", "").strip(): {
+            "company_website": c.get("website"),
+            "company_size": c.get("company_size"),
+            "company_linkedin_url": c.get("linkedin_url")
+        }
+        for c in companies
+    }
+    merged = []
+    for p in profiles:
+        company = p.get("company", "").strip()
+        details = company_map.get(company, {})
+        merged.append({
+            "query": p.get("query"),
+            "title": p.get("title"),
+            "url": p.get("url"),
+            "roles": p.get("roles"),
+            "company": company,
+            "company_website": details.get("company_website"),
+            "company_size": details.get("company_size"),
+            "company_linkedin_url": details.get("company_linkedin_url")
+        })
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False)
+    pd.DataFrame(merged).to_csv(csv_path, index=False, encoding="utf-8")
+
+def generate(profiles_path, companies_path):
+    rng = random.Random(SEED)
+    names = [f"Company {i} " + rng.choice(["Technologies Pvt Ltd", "Solutions", "Labs", "Infotech", ""]) for i in range(COMPANIES)]
+    companies = [{
+        "company_name": name.strip(),
+        "website": f"https://company{i}.example.com",
+        "linkedin_urls": [f"https://www.linkedin.com/company/company-{i}"] if rng.random() < 0.7 else [],
+        "company_size": rng.choice([None, 12, 51, 230, 1200]),
+        "source_url": f"https://company{i}.example.com"
+    } for i, name in enumerate(names)]
+    with open(companies_path, "w", encoding="utf-8") as f:
+        json.dump(companies, f)
+
+    with open(profiles_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(PROFILES):
+            company = rng.choice(names).strip()
+            if rng.random() < 0.1:
+                company = company.split(" ")[0] + " " + company.split(" ")[1]  # "Company 42" without the suffix
+            profile = {
+                "query": f'site:linkedin.com/in "{company}" CEO',
+                "company": company,
+                "url": f"https://www.linkedin.com/in/person-{i}",
+                "title": f"Person {i} - CEO - {company} | LinkedIn",
+                "roles": rng.choice(["CEO", "CTO", "CEO, Founder", "HR Head"])
+            }
+            f.write(("," if i else "") + json.dumps(profile))
+        f.write("]")
+
+def run(name, profiles_path, companies_path):
+    """Runs in a fresh process so peak RSS belongs to one implementation."""
+    out = os.path.join(FIXTURE_DIR, name)
+    start = time.perf_counter()
+    if name == "legacy":
+        legacy_merge(profiles_path, companies_path, out + ".json", out + ".csv")
+    else:
+        merger.merge(profiles_path, companies_path, out + ".json", out + ".csv", out + ".parquet", out + "_report.json")
+    return time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    profiles_path = os.path.join(FIXTURE_DIR, "profiles.json")
+    companies_path = os.path.join(FIXTURE_DIR, "companies.json")
+    if not os.path.exists(profiles_path) or "--regenerate" in sys.argv:
+        print(f"🧪 Generating {PROFILES:,} profiles and {COMPANIES:,} companies")
+        generate(profiles_path, companies_path)
+
+    for name in ("legacy", "columnar"):
+        with ProcessPoolExecutor(1) as pool:
+            seconds, peak_mb = pool.submit(run, name, profiles_path, companies_path).result()
+        print(f"{name:<10}{seconds:>8.1f}s{peak_mb:>10.0f} MB peak")
+
+    columns = ["company_website", "company_linkedin_url"]
+    legacy = pd.read_csv(os.path.join(FIXTURE_DIR, "legacy.csv"), usecols=columns)
+    columnar = pd.read_csv(os.path.join(FIXTURE_DIR, "columnar.csv"), usecols=columns)
+    exact = legacy["company_website"].notna()
+    agree = (legacy["company_website"][exact] == columnar["company_website"][exact]).all()
+    print(f"🔗 websites: legacy {exact.sum():,}, columnar {columnar['company_website'].notna().sum():,} "
+          f"({'✅ agrees on every legacy match' if agree else '❌ disagrees with legacy'})")
+    print(f"🔗 LinkedIn URLs: legacy {legacy['company_linkedin_url'].notna().sum():,} "
+          f"(reads linkedin_url), columnar {columnar['company_linkedin_url'].notna().sum():,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import glob
+import os
+
+from prompt_text import PROMPT_TOKEN_BUDGET, count_tokens, extract_prompt_text, legacy_website_text, tokenizer_name
+
+CORPUS_DIR = "fixtures/websites"  # saved company homepages (*.html)
+
+def main():
+    paths = sorted(glob.glob(os.path.join(CORPUS_DIR, "*.html")))
+    if not paths:
+        print(f"❌ No saved pages found in {CORPUS_DIR}")
+        return
+
+    before = []
+    after = []
+    print(f"{'page':<40}{'before':>8}{'after':>8}")
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        before.append(count_tokens(legacy_website_text(html)))
+        after.append(count_tokens(extract_prompt_text(html)))
+        print(f"{os.path.basename(path):<40}{before[-1]:>8}{after[-1]:>8}")
+
+    avg_before = sum(before) / len(before)
+    avg_after = sum(after) / len(after)
+    print(f"\n📊 {len(paths)} pages, tokenizer: {tokenizer_name()}, budget: {PROMPT_TOKEN_BUDGET}")
+    print(f"Before (stripped_strings, 20k chars): {avg_before:,.0f} tokens/company")
+    print(f"After (boilerplate removed, ranked):  {avg_after:,.0f} tokens/company")
+    if avg_before:
+        print(f"✅ {1 - avg_after / avg_before:.0%} fewer website-text input tokens")
+
+if __name__ == "__main__":
+    main()
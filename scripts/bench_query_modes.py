@@ -0,0 +1,71 @@
+import asyncio
+import os
+import sys
+
+import linkedin_profile_scraper as scraper
+from search_cache import SearchCache
+from serper_client import SerperClient
+
+FIXTURE_DB = "fixtures/serper_queries.sqlite"  # recorded Serper responses
+RECORD_COMPANIES = 50  # companies captured by `record`
+MODES = ["per_role", "batched"]
+
+class ReplayClient(SerperClient):
+    """Serves searches from a recording only; every search still counts as a paid call."""
+
+    def __init__(self, recording):
+        super().__init__(use_cache=False)
+        self.recording = recording
+        self.unrecorded = 0
+
+    async def _fetch(self, payload):
+        self.calls += 1
+        data = self.recording.get(payload)
+        if data is None:
+            self.unrecorded += 1
+            return {}
+        return data
+
+async def run_mode(client, queries, mode):
+    outcomes = []
+    for unit in asyncio.as_completed(scraper.query_units(client, queries, mode)):
+        outcomes.extend(await unit)
+    return outcomes
+
+async def record(queries):
+    """Run both modes live so every query they issue ends up in FIXTURE_DB."""
+    os.makedirs(os.path.dirname(FIXTURE_DB), exist_ok=True)
+    async with SerperClient(cache=SearchCache(FIXTURE_DB, ttl_days=36500)) as client:
+        for mode in MODES:
+            await run_mode(client, queries, mode)
+    print(f"💾 Recorded queries for {len({q['company'] for q in queries})} companies in {FIXTURE_DB}")
+
+async def report(queries):
+    recording = SearchCache(FIXTURE_DB, ttl_days=36500)
+    stats = {}
+    for mode in MODES:
+        async with ReplayClient(recording) as client:
+            outcomes = await run_mode(client, queries, mode)
+        stats[mode] = {
+            "calls": client.calls,
+            "unrecorded": client.unrecorded,
+            "roles": {q["query"] for q, profiles in outcomes if profiles},
+            "urls": {p["url"] for _, profiles in outcomes for p in profiles}
+        }
+    recording.close()
+
+    baseline = stats["per_role"]
+    print(f"\n{'mode':<10}{'calls':>8}{'calls/co':>10}{'roles found':>13}{'profiles':>10}{'role recall':>13}{'profile recall':>16}")
+    companies = len({q["company"] for q in queries})
+    for mode, s in stats.items():
+        role_recall = len(s["roles"] & baseline["roles"]) / max(1, len(baseline["roles"]))
+        url_recall = len(s["urls"] & baseline["urls"]) / max(1, len(baseline["urls"]))
+        print(f"{mode:<10}{s['calls']:>8}{s['calls'] / max(1, companies):>10.1f}{len(s['roles']):>13}"
+              f"{len(s['urls']):>10}{role_recall:>13.0%}{url_recall:>16.0%}")
+        if s["unrecorded"]:
+            print(f"   ⚠️ {s['unrecorded']} searches were not in the recording; run `record` again")
+
+if __name__ == "__main__":
+    companies = list(dict.fromkeys(scraper.load_companies()))[:RECORD_COMPANIES]
+    queries = scraper.generate_linkedin_queries(companies)
+    asyncio.run(record(queries) if sys.argv[1:] == ["record"] else report(queries))
@@ -1,23 +1,53 @@
 import os
+import sys
 import json
 import time
+import asyncio
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import pandas as pd
 import requests
+import openai
 from dotenv import load_dotenv
-from openai import OpenAI
-from bs4 import BeautifulSoup
+from openai import OpenAI, AsyncOpenAI
+
+from llm_cache import LLMCache, llm_cache_key, print_stats
+from page_cache import PageCache
+from prompt_text import count_tokens, extract_prompt_text
+from rate_limit import MinuteLimits, backoff_delay, retry_after_seconds
 
 # ==============================
 # CONFIG
 # ==============================
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+USE_LLM_CACHE = os.getenv("USE_LLM_CACHE", "1") != "0"  # skip the LLM for companies whose website hasn't changed
+page_cache = None  # PageCache shared with linkedin_search.py, opened by main()
+llm_cache = None  # LLMCache, opened by main() when USE_LLM_CACHE is on
 
 INPUT_FILE = "linkedin_profiles_enriched.json"
 OUTPUT_FILE = "companies_classified.json"
-PARTIAL_FILE = "companies_classified_partial.json"
-SAVE_EVERY = 5  # save partial results after N companies
+PARTIAL_FILE = "companies_classified_partial.jsonl"  # one line per enriched company, appended as they finish
 LIMIT = None  # set for testing
 
+MODEL = "gpt-4o-mini"
+ENGINE = os.getenv("ENRICH_ENGINE", "async")  # "async" (concurrent), "sequential" or "batch" (OpenAI Batch API)
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "500"))  # requests per minute allowed by your tier
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", "200000"))  # tokens per minute allowed by your tier
+LLM_CONCURRENCY = 16  # chat completions in flight
+FETCH_WORKERS = 8  # website downloads in flight (threads)
+LLM_MAX_RETRIES = 5
+EXPECTED_OUTPUT_TOKENS = 200  # reserved per call until the real usage comes back
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# 🔹 Batch mode: half price, no client-side rate limits, results within 24h
+BATCH_INPUT_FILE = "companies_batch_input.jsonl"
+BATCH_STATE_FILE = "companies_batch_state.json"  # lets a later run resume polling a submitted batch
+BATCH_POLL_SECONDS = 60
+BATCH_DONE_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
 # ==============================
 # HELPERS
 # ==============================
@@ -31,118 +61,431 @@ def save_json(path, data):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
+def open_caches():
+    global page_cache, llm_cache
+    page_cache = PageCache()
+    llm_cache = LLMCache() if USE_LLM_CACHE else None
+
+def close_caches():
+    global page_cache, llm_cache
+    if llm_cache:
+        print(f"💾 LLM cache: {llm_cache.hits}/{llm_cache.lookups} hits, {llm_cache.tokens_saved:,} tokens saved")
+        llm_cache.close()
+    if page_cache:
+        page_cache.close()  # also evicts past PAGE_CACHE_MAX_MB
+    page_cache = llm_cache = None
+
 def fetch_website_text(url):
-    """Fetch website content as plain text."""
+    """Fetch website content as token-budgeted prompt text (through the shared page cache when open)."""
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=10)
+        get = lambda u, extra: requests.get(u, headers={**headers, **extra}, timeout=10)
+        resp = page_cache.fetch_sync(get, url) if page_cache else get(url, {})
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.text, "html.parser")
-            texts = soup.stripped_strings
-            return " ".join(texts)[:20000]  # limit to 20k chars
+            return extract_prompt_text(resp.text)
     except Exception as e:
         print(f"⚠️ Error fetching {url}: {e}")
     return ""
 
+SYSTEM_PROMPT = (
+    "You are a company analyst. Given a company name and website content, "
+    "return a JSON object (respond only in JSON format) with these fields:\n"
+    "- is_it_services: true/false based on website\n"
+    "- industry_summary: max 3 words describing the industry\n"
+    "- company_summary: exactly 10 words describing the company\n"
+    "- technologies_used: list of technologies mentioned in website; if none, infer from summary\n"
+    "- company_size: number or estimate (like 51-200)\n"
+    "- company_linkedin_url: official LinkedIn URL; null if not found\n"
+)
+
+def build_messages(name, website_text, existing_entry):
+    prompt = {"role": "system", "content": SYSTEM_PROMPT}
+
+    user_msg = {
+        "role": "user",
+        "content": json.dumps({
+            "company": name,
+            "website_text": website_text or "No website data",
+            "existing": existing_entry
+        })
+    }
+    return [prompt, user_msg]
+
+FALLBACK_FLAG = "_fallback"  # marks results made up from existing data after an LLM failure
+
+def fallback_enrichment(existing_entry):
+    return {
+        FALLBACK_FLAG: True,
+        "is_it_services": None,
+        "industry_summary": None,
+        "company_summary": None,
+        "technologies_used": existing_entry.get("technologies_used", []),
+        "company_size": existing_entry.get("company_size"),
+        "company_linkedin_url": existing_entry.get("company_linkedin_url")
+    }
+
+def cached_enrichment(name, website_text):
+    """(cache key, cached result or None) for this company and website text."""
+    key = llm_cache_key(MODEL, SYSTEM_PROMPT, name, website_text)
+    return key, llm_cache.get(key) if llm_cache else None
+
+def remember(key, name, enriched, usage):
+    if llm_cache:
+        llm_cache.put(key, MODEL, name, enriched, usage.total_tokens if usage else 0)
+
 def llm_enrich_company(name, website_text, existing_entry):
     """Call LLM to enrich company details from website."""
+    key, cached = cached_enrichment(name, website_text)
+    if cached is not None:
+        return cached
     try:
-        prompt = {
-            "role": "system",
-            "content": (
-                "You are a company analyst. Given a company name and website content, "
-                "return a JSON object (respond only in JSON format) with these fields:\n"
-                "- is_it_services: true/false based on website\n"
-                "- industry_summary: max 3 words describing the industry\n"
-                "- company_summary: exactly 10 words describing the company\n"
-                "- technologies_used: list of technologies mentioned in website; if none, infer from summary\n"
-                "- company_size: number or estimate (like 51-200)\n"
-                "- company_linkedin_url: official LinkedIn URL; null if not found\n"
-            )
-        }
-
-        user_msg = {
-            "role": "user",
-            "content": json.dumps({
-                "company": name,
-                "website_text": website_text or "No website data",
-                "existing": existing_entry
-            })
-        }
-
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[prompt, user_msg],
+            model=MODEL,
+            messages=build_messages(name, website_text, existing_entry),
             response_format={"type": "json_object"},
             temperature=0
         )
-        result = response.choices[0].message.content
-        return json.loads(result)
+        result = json.loads(response.choices[0].message.content)
+        remember(key, name, result, response.usage)
+        return result
 
     except Exception as e:
         print(f"❌ LLM enrichment error for {name}: {e}")
-        return {
-            "is_it_services": None,
-            "industry_summary": None,
-            "company_summary": None,
-            "technologies_used": existing_entry.get("technologies_used", []),
-            "company_size": existing_entry.get("company_size"),
-            "company_linkedin_url": existing_entry.get("company_linkedin_url")
-        }
+        return fallback_enrichment(existing_entry)
+
+def estimate_tokens(messages):
+    """Prompt size plus the expected completion."""
+    return sum(count_tokens(m["content"]) for m in messages) + EXPECTED_OUTPUT_TOKENS
+
+async def llm_enrich_company_async(llm, limits, name, website_text, existing_entry):
+    """Async twin of llm_enrich_company that waits for RPM/TPM budget and retries transient errors."""
+    key, cached = cached_enrichment(name, website_text)
+    if cached is not None:
+        return cached
+    messages = build_messages(name, website_text, existing_entry)
+    estimate = estimate_tokens(messages)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        await limits.acquire(estimate)
+        try:
+            raw = await llm.chat.completions.with_raw_response.create(
+                model=MODEL,
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+            limits.observe(raw.headers)
+            response = raw.parse()
+            if response.usage:
+                limits.settle(estimate, response.usage.total_tokens)
+            result = json.loads(response.choices[0].message.content)
+            remember(key, name, result, response.usage)
+            return result
+        except RETRYABLE_ERRORS as e:
+            headers = getattr(getattr(e, "response", None), "headers", None) or {}
+            limits.observe(headers)
+            if attempt == LLM_MAX_RETRIES:
+                print(f"❌ LLM enrichment error for {name} after {attempt + 1} attempts: {e}")
+                break
+            await asyncio.sleep(retry_after_seconds(headers) or backoff_delay(attempt))
+        except Exception as e:
+            print(f"❌ LLM enrichment error for {name}: {e}")
+            break
+    return fallback_enrichment(existing_entry)
+
+async def enrich_all(jobs, on_done=None):
+    """Enrich {company key: entry} jobs concurrently, returning {company key: enriched}.
+
+    Website downloads run in worker threads while other companies are with the
+    LLM, so both kinds of latency overlap. `on_done(key, enriched)` is called as
+    each company finishes.
+    """
+    limits = MinuteLimits(OPENAI_RPM, OPENAI_TPM)
+    fetch_slots = asyncio.Semaphore(FETCH_WORKERS)
+    llm_slots = asyncio.Semaphore(LLM_CONCURRENCY)
+    results = {}
+
+    async def enrich(llm, key, entry):
+        website = entry.get("company_website")
+        website_text = ""
+        if website:
+            async with fetch_slots:
+                website_text = await asyncio.to_thread(fetch_website_text, website)
+        async with llm_slots:
+            results[key] = await llm_enrich_company_async(llm, limits, entry.get("company", ""), website_text, entry)
+        if on_done:
+            on_done(key, results[key])
+
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0) as llm:
+        await asyncio.gather(*(enrich(llm, key, entry) for key, entry in jobs.items()))
+    return results
+
+# 🔹 LLM field -> profile field; fill-only fields never replace a value the profile already has
+ENRICHED_FIELDS = {
+    "is_it_services": "is_it_services",
+    "industry_summary": "industry",
+    "company_summary": "company_summary",
+    "technologies_used": "technologies_used",
+    "company_size": "company_size",
+    "company_linkedin_url": "company_linkedin_url"
+}
+FILL_ONLY_FIELDS = {"company_size", "company_linkedin_url"}
+
+def company_key(entry):
+    """Profiles of the same company share a key: their website (host + path) or else the normalized name."""
+    website = str(entry.get("company_website") or "").strip().lower()
+    if website:
+        parsed = urlparse(website if "://" in website else "https://" + website)
+        host = parsed.netloc[4:] if parsed.netloc.startswith("www.") else parsed.netloc
+        return host + parsed.path.rstrip("/")
+    return "name:" + re.sub(r"[^a-z0-9]+", " ", str(entry.get("company") or "").lower()).strip()
+
+def group_companies(data):
+    """{company key: first profile of that company}."""
+    jobs = {}
+    for entry in data:
+        jobs.setdefault(company_key(entry), entry)
+    return jobs
+
+def as_objects(series):
+    return series.astype(object).where(series.notna(), None)
+
+def fan_out(data, enriched):
+    """Join {company key: enriched} back onto every profile.
+
+    A pandas left merge pairs each profile with its company's result, and the
+    overwrite rules are applied column-wise: a field is taken when the model
+    returned something (any non-null is_it_services), and fill-only fields
+    only where the profile had nothing.
+    """
+    profiles = pd.DataFrame({
+        "key": [company_key(entry) for entry in data],
+        **{field: [entry.get(field) for entry in data] for field in FILL_ONLY_FIELDS}
+    })
+    companies = pd.DataFrame(
+        [{"key": key, **{f"new_{field}": result.get(field) for field in ENRICHED_FIELDS}} for key, result in enriched.items()],
+        columns=["key"] + [f"new_{field}" for field in ENRICHED_FIELDS],
+        dtype=object  # keep the model's values as given (51 must not become 51.0)
+    )
+    joined = profiles.merge(companies, on="key", how="left")
+
+    updates = pd.DataFrame(index=joined.index)
+    for source, target in ENRICHED_FIELDS.items():
+        new = as_objects(joined[f"new_{source}"])
+        keep = new.notna() if source == "is_it_services" else new.map(bool)
+        if source in FILL_ONLY_FIELDS:
+            keep &= ~as_objects(joined[target]).map(bool)
+        updates[target] = new.where(keep, None)
+
+    for entry, row in zip(data, updates.to_dict(orient="records")):
+        entry.update({field: value for field, value in row.items() if value is not None})
+    return data
+
+def load_checkpoint(path=PARTIAL_FILE):
+    """{company key: enriched} already appended to the checkpoint by an interrupted run."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    line = ""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            done[record["key"]] = record["enriched"]
+    if line and not line.endswith("\n"):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n")  # so the next append starts on its own line
+    return done
 
 # ==============================
 # MAIN SCRIPT
 # ==============================
-def main():
-    data = load_json(INPUT_FILE)
-    print(f"📂 Loaded {len(data)} profiles")
+def enrich_sequential(jobs, on_done):
+    for i, (key, entry) in enumerate(jobs.items(), start=1):
+        company_name = entry.get("company", "")
+        website = entry.get("company_website")
+        print(f"🔎 Enriching {company_name} ({i}/{len(jobs)})...")
 
-    results = []
-    cache = {}  # cache enrichment per website
+        website_text = fetch_website_text(website) if website else ""
+        on_done(key, llm_enrich_company(company_name, website_text, entry))
+        time.sleep(0.2)  # gentle on requests
 
-    for i, entry in enumerate(data, start=1):
-        if LIMIT and i > LIMIT:
-            break
+def enrich_concurrent(jobs, on_done):
+    print(f"🚀 Enriching {len(jobs)} companies concurrently")
+    asyncio.run(enrich_all(jobs, on_done))
 
-        company_name = entry.get("company", "")
-        website = entry.get("company_website")
-        cache_key = website or company_name
+# ==============================
+# BATCH MODE
+# ==============================
+def custom_id_for(key):
+    """Stable batch custom_id for a cache key, so results map back without extra state."""
+    return "company-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def batch_request(custom_id, name, website_text, existing_entry):
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": MODEL,
+            "messages": build_messages(name, website_text, existing_entry),
+            "response_format": {"type": "json_object"},
+            "temperature": 0
+        }
+    }
+
+def write_batch_file(jobs, website_texts, path=BATCH_INPUT_FILE):
+    """One chat-completion request per {company key: entry} job; returns the number written."""
+    with open(path, "w", encoding="utf-8") as f:
+        for key, entry in jobs.items():
+            request = batch_request(custom_id_for(key), entry.get("company", ""), website_texts.get(key, ""), entry)
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+    return len(jobs)
+
+def submit_batch(llm, path=BATCH_INPUT_FILE):
+    with open(path, "rb") as f:
+        uploaded = llm.files.create(file=f, purpose="batch")
+    batch = llm.batches.create(input_file_id=uploaded.id, endpoint="/v1/chat/completions", completion_window="24h")
+    save_json(BATCH_STATE_FILE, {"batch_id": batch.id, "input_file_id": uploaded.id})
+    print(f"📤 Submitted batch {batch.id}")
+    return batch
+
+def wait_for_batch(llm, batch_id, poll_seconds=BATCH_POLL_SECONDS):
+    while True:
+        batch = llm.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        if counts:
+            print(f"⏳ Batch {batch_id}: {batch.status} ({counts.completed}/{counts.total} done, {counts.failed} failed)")
+        if batch.status in BATCH_DONE_STATUSES:
+            return batch
+        time.sleep(poll_seconds)
 
-        print(f"🔎 Enriching {company_name} ({i}/{len(data)})...")
+def parse_batch_output(text):
+    """{custom_id: (enriched dict, total tokens)} for every successful line of a batch output file."""
+    results = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            continue
+        try:
+            body = response["body"]
+            content = body["choices"][0]["message"]["content"]
+            results[record["custom_id"]] = (json.loads(content), (body.get("usage") or {}).get("total_tokens", 0))
+        except (KeyError, IndexError, TypeError, ValueError):
+            print(f"⚠️ Unreadable batch result for {record.get('custom_id')}")
+    return results
 
-        # Check cache to avoid duplicate calls
-        if cache_key in cache:
-            enriched = cache[cache_key]
+def enrich_batch(jobs, on_done, llm=None, poll_seconds=BATCH_POLL_SECONDS):
+    """Enrich {company key: entry} jobs through the Batch API, mapping results back by custom_id.
+
+    If BATCH_STATE_FILE names a submitted batch, polling resumes there instead
+    of submitting again. `llm` defaults to the module's OpenAI client.
+    """
+    llm = llm or client
+    # Website text is part of the LLM cache key, so it is needed even when resuming
+    keys = [key for key, entry in jobs.items() if entry.get("company_website")]
+    with ThreadPoolExecutor(FETCH_WORKERS) as pool:
+        texts = pool.map(fetch_website_text, [jobs[key]["company_website"] for key in keys])
+        website_texts = dict(zip(keys, texts))
+
+    enriched = {}
+    pending = {}
+    llm_keys = {}
+    for key, entry in jobs.items():
+        llm_key, cached = cached_enrichment(entry.get("company", ""), website_texts.get(key, ""))
+        if cached is not None:
+            enriched[custom_id_for(key)] = cached
         else:
-            website_text = fetch_website_text(website) if website else ""
-            enriched = llm_enrich_company(company_name, website_text, entry)
-            cache[cache_key] = enriched
-            time.sleep(0.2)  # gentle on requests
-
-        # Update entry, only overwrite null/empty values
-        if enriched.get("is_it_services") is not None:
-            entry["is_it_services"] = enriched["is_it_services"]
-        if enriched.get("industry_summary"):
-            entry["industry"] = enriched["industry_summary"]
-        if enriched.get("company_summary"):
-            entry["company_summary"] = enriched["company_summary"]
-        if enriched.get("technologies_used"):
-            entry["technologies_used"] = enriched["technologies_used"]
-        if not entry.get("company_size") and enriched.get("company_size"):
-            entry["company_size"] = enriched["company_size"]
-        if not entry.get("company_linkedin_url") and enriched.get("company_linkedin_url"):
-            entry["company_linkedin_url"] = enriched["company_linkedin_url"]
-
-        results.append(entry)
-
-        # Partial save
-        if i % SAVE_EVERY == 0:
-            save_json(PARTIAL_FILE, results)
-            print(f"💾 Partial save after {i} companies")
+            pending[key] = entry
+            llm_keys[custom_id_for(key)] = (llm_key, entry.get("company", ""))
+    print(f"🗄️ {len(enriched)} companies served from the LLM cache, {len(pending)} to submit")
+
+    state = load_json(BATCH_STATE_FILE)
+    if pending:
+        if state:
+            print(f"🔁 Resuming batch {state['batch_id']}")
+            batch_id = state["batch_id"]
+        else:
+            count = write_batch_file(pending, website_texts)
+            print(f"📝 Wrote {count} requests to {BATCH_INPUT_FILE}")
+            batch_id = submit_batch(llm).id
+
+        batch = wait_for_batch(llm, batch_id, poll_seconds)
+        returned = {}
+        if batch.status == "completed" and batch.output_file_id:
+            returned = parse_batch_output(llm.files.content(batch.output_file_id).text)
+        else:
+            print(f"❌ Batch {batch_id} ended as {batch.status}")
+        for custom_id, (result, tokens) in returned.items():
+            enriched[custom_id] = result
+            if llm_cache and custom_id in llm_keys:
+                llm_key, name = llm_keys[custom_id]
+                llm_cache.put(llm_key, MODEL, name, result, tokens)
+        print(f"📥 {len(returned)}/{len(pending)} companies enriched by the batch")
+
+    missing = 0
+    for key, entry in jobs.items():
+        result = enriched.get(custom_id_for(key))
+        if result is None:
+            missing += 1
+            result = fallback_enrichment(entry)
+        on_done(key, result)
+    if missing:
+        print(f"⚠️ {missing} companies fell back to existing data")
+    if os.path.exists(BATCH_STATE_FILE):
+        os.remove(BATCH_STATE_FILE)
+
+def main(engine=ENGINE):
+    open_caches()
+    try:
+        run(engine)
+    finally:
+        close_caches()
+
+def run(engine):
+    data = load_json(INPUT_FILE)
+    print(f"📂 Loaded {len(data)} profiles")
+    if LIMIT:
+        data = data[:LIMIT]
+
+    jobs = group_companies(data)
+    done = load_checkpoint()
+    pending = {key: entry for key, entry in jobs.items() if key not in done}
+    print(f"🏢 {len(jobs)} unique companies, {len(done)} already in {PARTIAL_FILE}, {len(pending)} to enrich")
+
+    with open(PARTIAL_FILE, "a", encoding="utf-8") as checkpoint:
+        def on_done(key, enriched):
+            done[key] = enriched
+            # Fallbacks stay out of the checkpoint so a resumed run asks the model again
+            if not enriched.get(FALLBACK_FLAG):
+                checkpoint.write(json.dumps({"key": key, "enriched": enriched}, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+            if engine != "sequential":
+                print(f"✅ {jobs[key].get('company', '')} ({len(done)}/{len(jobs)})")
+
+        if engine == "sequential":
+            enrich_sequential(pending, on_done)
+        elif engine == "batch":
+            enrich_batch(pending, on_done)
+        else:
+            enrich_concurrent(pending, on_done)
+
+    fallbacks = sum(1 for enriched in done.values() if enriched.get(FALLBACK_FLAG))
+    if fallbacks:
+        print(f"⚠️ {fallbacks} companies kept their existing data after LLM errors")
+    results = fan_out(data, done)
 
     # Final save
     save_json(OUTPUT_FILE, results)
+    os.remove(PARTIAL_FILE)
     print(f"✅ Enrichment complete. Saved {len(results)} companies to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["stats"]:
+        print_stats()
+        exit()
+    main(sys.argv[1] if len(sys.argv) > 1 else ENGINE)
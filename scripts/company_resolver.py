@@ -0,0 +1,156 @@
+import json
+import re
+from collections import Counter, defaultdict
+from rapidfuzz import fuzz, process
+
+# Legal forms never tell two companies apart; generic descriptors rarely do,
+# so "Acme Technologies Pvt Ltd", "ACME Tech" and "Acme" share the core "acme".
+LEGAL_WORDS = {
+    "pvt", "private", "ltd", "limited", "llp", "llc", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "pte", "the"
+}
+GENERIC_WORDS = {
+    "technologies", "technology", "tech", "solutions", "solution", "services", "service", "software",
+    "systems", "system", "consulting", "consultancy", "consultants", "infotech", "infosystems",
+    "global", "international", "india", "group", "labs"
+}
+FUZZY_THRESHOLD = 90  # token_sort_ratio on core names
+AMBIGUITY_MARGIN = 3  # top two fuzzy candidates closer than this are left unmatched
+MAX_BLOCK_SIZE = 500  # blocking keys shared by more names than this are too common to narrow anything
+
+def normalize_company(name):
+    """Lowercase word tokens without punctuation or legal-form words."""
+    text = str(name or "").lower().replace("&", " and ")
+    return " ".join(t for t in re.findall(r"[^\W_]+", text) if t not in LEGAL_WORDS)
+
+def core_name(normalized):
+    return " ".join(t for t in normalized.split() if t not in GENERIC_WORDS) or normalized
+
+def blocking_keys(core):
+    """Whole tokens plus 4-character prefixes, so typos past the prefix still meet."""
+    keys = set()
+    for token in core.split():
+        keys.add(token)
+        if len(token) > 4:
+            keys.add(token[:4] + "*")
+    return keys
+
+class CompanyIndex:
+    """Resolves free-text company names against a list of known (canonical) names.
+
+    Lookups try the normalized name, then the core name, then fuzzy scoring
+    against only the names that share a blocking key, so resolving against
+    100k companies never compares every pair. Near-ties are reported as
+    ambiguous rather than guessed. Results are memoized per input string.
+    """
+
+    def __init__(self, names):
+        self.names = []
+        self.normalized = []
+        self.cores = []
+        self.by_normalized = {}
+        self.by_core = defaultdict(list)
+        self.blocks = defaultdict(list)
+        self.cache = {}
+        self.counts = Counter()
+        self.fuzzy = {}
+        self.ambiguous = {}
+
+        for name in names:
+            normalized = normalize_company(name)
+            if not normalized or normalized in self.by_normalized:
+                continue
+            i = len(self.names)
+            core = core_name(normalized)
+            self.names.append(name)
+            self.normalized.append(normalized)
+            self.cores.append(core)
+            self.by_normalized[normalized] = i
+            self.by_core[core].append(i)
+            for key in blocking_keys(core):
+                self.blocks[key].append(i)
+
+    def containing(self, core):
+        """Indexes of known names whose core has every token of `core`."""
+        tokens = core.split()
+        found = set(self.blocks.get(tokens[0], ()))
+        for token in tokens[1:]:
+            found &= set(self.blocks.get(token, ()))
+        return found
+
+    def resolve(self, name):
+        """Canonical name for `name`, or None when it is unknown or ambiguous."""
+        if name not in self.cache:
+            self.cache[name] = self._resolve(name)
+        canonical, method = self.cache[name]
+        self.counts[method] += 1
+        return canonical
+
+    def _resolve(self, name):
+        normalized = normalize_company(name)
+        if not normalized:
+            return None, "empty"
+        if normalized in self.by_normalized:
+            return self.names[self.by_normalized[normalized]], "exact"
+
+        core = core_name(normalized)
+        same_core = self.by_core.get(core, [])
+        if len(same_core) == 1:
+            # "Tata" is TCS's whole core but also part of "Tata Motors": a bare core that
+            # other names extend is as ambiguous as two names with the same core
+            containing = self.containing(core)
+            if len(containing) > 1:
+                # ...unless the full name still picks one ("Tata Consultancy")
+                tokens = set(normalized.split())
+                containing = {i for i in containing if tokens <= set(self.normalized[i].split())} or containing
+            if len(containing) > 1:
+                self.ambiguous[name] = [
+                    (self.names[i], round(fuzz.token_sort_ratio(core, self.cores[i]), 1)) for i in sorted(containing)
+                ]
+                return None, "ambiguous"
+            return self.names[min(containing, default=same_core[0])], "core"
+        if same_core:
+            self.ambiguous[name] = [(self.names[i], 100) for i in same_core]
+            return None, "ambiguous"
+
+        candidates = set()
+        for key in blocking_keys(core):
+            block = self.blocks.get(key, ())
+            if len(block) <= MAX_BLOCK_SIZE:
+                candidates.update(block)
+        if not candidates:
+            return None, "unmatched"
+
+        best = process.extract(
+            core,
+            {i: self.cores[i] for i in candidates},
+            scorer=fuzz.token_sort_ratio,
+            limit=2,
+            score_cutoff=FUZZY_THRESHOLD
+        )
+        if not best:
+            return None, "unmatched"
+        if len(best) == 2 and best[0][1] - best[1][1] < AMBIGUITY_MARGIN:
+            self.ambiguous[name] = [(self.names[i], round(score, 1)) for _, score, i in best]
+            return None, "ambiguous"
+        _, score, i = best[0]
+        self.fuzzy[name] = (self.names[i], round(score, 1))
+        return self.names[i], "fuzzy"
+
+    def report(self):
+        return {
+            "known_companies": len(self.names),
+            "distinct_lookups": len(self.cache),
+            "lookups_by_method": dict(self.counts),
+            "fuzzy_matches": [{"name": n, "matched": m, "score": s} for n, (m, s) in sorted(self.fuzzy.items())],
+            "ambiguous": [
+                {"name": n, "candidates": [{"company": c, "score": s} for c, s in cands]}
+                for n, cands in sorted(self.ambiguous.items())
+            ]
+        }
+
+    def write_report(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        counts = ", ".join(f"{method}: {n}" for method, n in self.counts.most_common())
+        print(f"🧩 Company resolution ({counts}); {len(self.ambiguous)} ambiguous names -> {path}")
@@ -1,13 +1,9 @@
-import os
-import requests
+import asyncio
+import httpx
 import pandas as pd
-from dotenv import load_dotenv
-from time import sleep
 from urllib.parse import urlparse
 
-# Load environment variables
-load_dotenv()
-SERPER_KEY = os.getenv("SERPER_KEY")
+from serper_client import SerperClient
 
 INPUT_FILE = "naukri_jobs_clean.csv"
 OUTPUT_FILE = "naukri_with_websites.csv"
@@ -31,24 +27,15 @@ def is_valid_company_website(url):
         return True
     return False
 
-def fetch_company_website(company_name):
+async def fetch_company_website(client, company_name):
     if not company_name or company_name.lower() == "unknown":
         return "N/A"
 
     query = f"{company_name} official website"
-    url = "https://google.serper.dev/search"
-
-    headers = {
-        "X-API-KEY": SERPER_KEY,
-        "Content-Type": "application/json"
-    }
-
     payload = {"q": query, "num": 3}
 
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        data = await client.search(payload)
 
         if "organic" in data:
             for item in data["organic"]:
@@ -59,24 +46,30 @@ def fetch_company_website(company_name):
         else:
             return "Not Found"
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"⚠️ Error fetching {company_name}: {e}")
         return "Error"
 
+async def fetch_all_websites(companies):
+    """Look up every company concurrently under the client's rate limit."""
+    async with SerperClient() as client:
+        async def fetch(company):
+            website = await fetch_company_website(client, company)
+            print(f"   {company} → {website}")
+            return website
+        return await asyncio.gather(*(fetch(c) for c in companies))
+
 def main():
     df = pd.read_csv(INPUT_FILE)
     if "company" not in df.columns:
         raise ValueError("❌ CSV must have a 'company' column (lowercase)")
 
-    websites = []
-    for i, company in enumerate(df["company"], start=1):
-        print(f"[{i}/{len(df)}] Fetching website for: {company}")
-        website = fetch_company_website(company)
-        print(f"   → {website}")
-        websites.append(website)
-        sleep(1)
+    # Each distinct company is searched once, however many jobs it posted
+    companies = list(dict.fromkeys(df["company"]))
+    print(f"🔎 Fetching websites for {len(companies)} companies ({len(df)} rows)")
+    websites = dict(zip(companies, asyncio.run(fetch_all_websites(companies))))
 
-    df["website"] = websites
+    df["website"] = df["company"].map(websites)
     df.to_csv(OUTPUT_FILE, index=False)
     print(f"✅ Done! Results saved to {OUTPUT_FILE}")
 
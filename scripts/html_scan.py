@@ -0,0 +1,94 @@
+import re
+from lxml import etree
+
+# Streaming HTML scanners: lxml parser targets that see tags and text as they
+# are fed and set `done` once they have their answer, so callers can stop
+# reading the page there instead of building a full BeautifulSoup tree.
+
+EMPLOYEES_RE = re.compile(r"([\d,]+)\s+employees", re.IGNORECASE)
+SKIP_TEXT_TAGS = {"script", "style", "template", "noscript"}
+TEXT_WINDOW = 512  # trailing characters of page text kept for the size regex
+CHUNK_SIZE = 64 * 1024
+
+class LinkedInLinkScanner:
+    """Collects linkedin.com/company hrefs in document order, done after max_links."""
+
+    def __init__(self, max_links=1):
+        self.max_links = max_links
+        self.links = []
+        self.done = False
+
+    def start(self, tag, attrib):
+        if tag != "a" or self.done:
+            return
+        href = attrib.get("href")
+        if href and "linkedin.com/company" in href:
+            href = href.split("?")[0]
+            if href not in self.links:
+                self.links.append(href)
+                self.done = len(self.links) >= self.max_links
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        return self.links
+
+class CompanySizeScanner:
+    """Finds the first "N employees" in the visible page text, matching get_text(" ", strip=True)."""
+
+    def __init__(self):
+        self.size = None
+        self.done = False
+        self.text = ""
+        self.pieces = []
+        self.skip_depth = 0
+
+    def _flush(self):
+        piece = "".join(self.pieces).strip()
+        self.pieces = []
+        if not piece or self.done:
+            return
+        self.text = f"{self.text} {piece}" if self.text else piece
+        if len(self.text) > TEXT_WINDOW:
+            # Cut on a space so the window never starts mid-number
+            cut = self.text.find(" ", len(self.text) - TEXT_WINDOW // 2)
+            if cut != -1:
+                self.text = self.text[cut + 1:]
+        match = EMPLOYEES_RE.search(self.text)
+        if match:
+            self.size = int(match.group(1).replace(",", ""))
+            self.done = True
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag in SKIP_TEXT_TAGS:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        self._flush()
+        if tag in SKIP_TEXT_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def data(self, data):
+        if not self.skip_depth:
+            self.pieces.append(data)
+
+    def close(self):
+        self._flush()
+        return self.size
+
+def new_parser(target, encoding=None):
+    return etree.HTMLParser(target=target, encoding=encoding)
+
+def scan_text(html, target):
+    """Feed an already-downloaded page to target in chunks, stopping once it is done."""
+    parser = new_parser(target)
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+        if target.done:
+            break
+    return parser.close()
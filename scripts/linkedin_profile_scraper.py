@@ -1,21 +1,36 @@
-import requests
+import asyncio
+import httpx
 import json
 import os
-import time
+import re
+import sys
 import pandas as pd
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-SERPER_KEY = os.getenv("SERPER_KEY")  # Your Serper.dev API key
+from serper_client import SerperClient, SERPER_KEY
 
 CSV_FILE = "naukri_with_websites.csv"
 COMPANY_JSON = "company_linkedin_pages.json"
 OUTPUT_JSON = "linkedin_results.json"
 NO_RESULTS_JSON = "no_results.json"
+RESULTS_LOG = "linkedin_results.jsonl"  # append-only; OUTPUT_JSON is exported from it
+NO_RESULTS_LOG = "no_results.jsonl"  # append-only; NO_RESULTS_JSON is exported from it
 
 ROLES = ["Founder", "Co-Founder", "CEO", "Marketing Head", "Head of Marketing", "Business Development Head"]
 MAX_QUERIES = 1000  # Limit number of queries per run
+SPECULATIVE_PATTERNS = False  # True trades extra searches for latency: all patterns start at once
+QUERY_MODE = "per_role"  # "batched": one OR-query per company, per-role queries only for roles it missed
+BATCH_NUM = 20  # results requested by a batched query
+
+# Title patterns used to assign batched results back to roles
+ROLE_TITLE_PATTERNS = {
+    "Founder": r"(?<![\w-])(?<!co )founder\b",
+    "Co-Founder": r"\bco[- ]?founder\b",
+    "CEO": r"\bceo\b|\bchief executive\b",
+    "Marketing Head": r"\bmarketing head\b|\bhead\s*(?:of|-|,)?\s*marketing\b|\bcmo\b|\bchief marketing\b",
+    "Head of Marketing": r"\bmarketing head\b|\bhead\s*(?:of|-|,)?\s*marketing\b|\bcmo\b|\bchief marketing\b",
+    "Business Development Head": r"\bbusiness development head\b|\bhead\s*(?:of|-|,)?\s*(?:business development|bd)\b|\bbd head\b",
+}
+ROLE_TITLE_REGEXES = {role: re.compile(pattern, re.IGNORECASE) for role, pattern in ROLE_TITLE_PATTERNS.items()}
 
 # 🔹 Load company names in CSV row order
 def load_companies():
@@ -50,66 +65,209 @@ def generate_linkedin_queries(companies):
             })
     return queries
 
-# 🔹 Search LinkedIn profiles via Serper.dev
-def search_linkedin_profiles(query_obj):
-    company = query_obj["company"]
-    role = query_obj["role"]
-
-    search_patterns = [
+# 🔹 Search patterns for one role/company, tried in this order
+def build_search_patterns(role, company):
+    return [
         f'site:linkedin.com/in "{role} at {company}"',
         f'site:linkedin.com/in {role} {company}',
         f'site:linkedin.com/in {company} {role} LinkedIn'
     ]
 
-    url = "https://google.serper.dev/search"
-    headers = {"X-API-KEY": SERPER_KEY, "Content-Type": "application/json"}
+# 🔹 Run one search pattern and keep the LinkedIn profile hits
+async def search_pattern(client, query_obj, pattern):
+    data = {"q": pattern, "num": 5}
+    try:
+        results = await client.search(data)
+    except httpx.HTTPError as e:
+        print(f"❌ Error for query '{pattern}': {e}")
+        return []
 
     profiles = []
+    for result in results.get("organic", []):
+        link = result.get("link", "")
+        title = result.get("title", "")
+        if "linkedin.com/in/" in link:
+            profiles.append({
+                "query": query_obj["query"],
+                "role": query_obj["role"],
+                "company": query_obj["company"],
+                "title": title,
+                "url": link
+            })
+    return profiles
+
+# 🔹 Search LinkedIn profiles via Serper.dev (first pattern with results wins)
+async def search_linkedin_profiles(client, query_obj):
+    patterns = build_search_patterns(query_obj["role"], query_obj["company"])
 
-    for pattern in search_patterns:
-        data = {"q": pattern, "num": 5}
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            response.raise_for_status()
-            results = response.json()
-
-            for result in results.get("organic", []):
-                link = result.get("link", "")
-                title = result.get("title", "")
-                if "linkedin.com/in/" in link:
-                    profiles.append({
-                        "query": query_obj["query"],
-                        "role": role,
-                        "company": company,
-                        "title": title,
-                        "url": link
-                    })
+    if not SPECULATIVE_PATTERNS:
+        for pattern in patterns:
+            profiles = await search_pattern(client, query_obj, pattern)
             if profiles:  # Stop if we already got something
-                break
+                return profiles
+        return []
+
+    # Issue every pattern at once; the fallbacks are cancelled as soon as an earlier one hits
+    tasks = [asyncio.ensure_future(search_pattern(client, query_obj, p)) for p in patterns]
+    try:
+        for task in tasks:
+            profiles = await task
+            if profiles:
+                return profiles
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+
+# 🔹 Stream records from a JSONL log (a line torn by a crash is skipped)
+def iter_jsonl(path):
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping unreadable line in {path}")
+
+# 🔹 Open a JSONL log for appending, starting on a fresh line
+def open_log(path):
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    f = open(path, "a", encoding="utf-8")
+    if needs_newline:
+        f.write("\n")
+    return f
+
+# 🔹 One-time import of results saved as whole JSON files by earlier versions
+def migrate_legacy_json():
+    for legacy_path, log_path in [(OUTPUT_JSON, RESULTS_LOG), (NO_RESULTS_JSON, NO_RESULTS_LOG)]:
+        if os.path.exists(legacy_path) and not os.path.exists(log_path):
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            with open(log_path, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            print(f"📦 Imported {len(records)} records from '{legacy_path}' into '{log_path}'")
+
+# 🔹 Roles a profile title matches, e.g. "Co-Founder & CEO" -> ["Co-Founder", "CEO"]
+def classify_roles(title):
+    return [role for role, regex in ROLE_TITLE_REGEXES.items() if regex.search(title)]
+
+# 🔹 One OR-query covering several roles at a company
+def build_batch_query(company, roles):
+    terms = " OR ".join(f'"{role}"' if " " in role else role for role in roles)
+    return f'site:linkedin.com/in "{company}" ({terms})'
 
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error for query '{pattern}': {e}")
+# 🔹 Batched search: returns {role: profiles} for the roles one OR-query could fill
+async def search_company_roles(client, company, roles):
+    data = {"q": build_batch_query(company, roles), "num": BATCH_NUM}
+    try:
+        results = await client.search(data)
+    except httpx.HTTPError as e:
+        print(f"❌ Error for batched query '{data['q']}': {e}")
+        return {}
+
+    found = {}
+    for result in results.get("organic", []):
+        link = result.get("link", "")
+        title = result.get("title", "")
+        text = f"{title} {result.get('snippet', '')}".lower()
+        if "linkedin.com/in/" not in link or company.lower() not in text:
             continue
+        for role in classify_roles(title):
+            if role in roles:
+                found.setdefault(role, []).append({
+                    "query": f"{role} at {company}",
+                    "role": role,
+                    "company": company,
+                    "title": title,
+                    "url": link
+                })
+    return found
 
-    return profiles
+# 🔹 Batched mode for one company: OR-query first, per-role queries only for roles it missed
+async def run_company_batch(client, company_queries):
+    company = company_queries[0]["company"]
+    found = await search_company_roles(client, company, [q["role"] for q in company_queries])
+    missing = [q for q in company_queries if q["role"] not in found]
+    fallback = await asyncio.gather(*(search_linkedin_profiles(client, q) for q in missing))
+    found.update({q["role"]: profiles for q, profiles in zip(missing, fallback)})
+    return [(q, found[q["role"]]) for q in company_queries]
+
+# 🔹 Work units for a session; each resolves to a list of (query, profiles)
+def query_units(client, queries, mode=QUERY_MODE):
+    if mode == "batched":
+        by_company = {}
+        for q in queries:
+            by_company.setdefault(q["company"], []).append(q)
+        return [run_company_batch(client, group) for group in by_company.values()]
+
+    async def run(q):
+        return [(q, await search_linkedin_profiles(client, q))]
+    return [run(q) for q in queries]
 
 # 🔹 Load previous results to continue from last point
 def load_previous_results():
-    all_results = []
-    failed_queries = []
+    migrate_legacy_json()
+    processed_queries = set()
+    result_count = 0
+    failed_count = 0
+
+    for record in iter_jsonl(RESULTS_LOG):
+        processed_queries.add(record["query"])
+        result_count += 1
 
-    if os.path.exists(OUTPUT_JSON):
-        with open(OUTPUT_JSON, "r", encoding="utf-8") as f:
-            all_results = json.load(f)
+    for record in iter_jsonl(NO_RESULTS_LOG):
+        processed_queries.add(record["query"])
+        failed_count += 1
 
-    if os.path.exists(NO_RESULTS_JSON):
-        with open(NO_RESULTS_JSON, "r", encoding="utf-8") as f:
-            failed_queries = json.load(f)
+    return processed_queries, result_count, failed_count
 
-    return all_results, failed_queries
+# 🔹 Materialize the legacy JSON files (read by profile_cleaner_v2.py) from the logs
+def export_legacy_json():
+    for log_path, legacy_path in [(RESULTS_LOG, OUTPUT_JSON), (NO_RESULTS_LOG, NO_RESULTS_JSON)]:
+        records = list(iter_jsonl(log_path))
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+        print(f"📤 Exported {len(records)} records to '{legacy_path}'")
+
+# 🔹 Run all queries concurrently, appending each outcome to the logs as it finishes
+async def run_queries(queries_to_run):
+    found_count = 0
+    failed_count = 0
+    with open_log(RESULTS_LOG) as results_log, open_log(NO_RESULTS_LOG) as failed_log:
+        async with SerperClient() as client:
+            i = 0
+            for done in asyncio.as_completed(query_units(client, queries_to_run)):
+                for q, profiles in await done:
+                    i += 1
+                    print(f"🔎 [{i}/{len(queries_to_run)}] {q['query']}")
+                    if profiles:
+                        for profile in profiles:
+                            results_log.write(json.dumps(profile) + "\n")
+                        found_count += len(profiles)
+                        print(f"✅ Found {len(profiles)} profiles.")
+                    else:
+                        failed_log.write(json.dumps(q) + "\n")
+                        failed_count += 1
+                        print("⚠️ No results found.")
+                results_log.flush()
+                failed_log.flush()
+    return found_count, failed_count
 
 # 🔹 Main runner
 if __name__ == "__main__":
+    if sys.argv[1:] == ["export"]:
+        export_legacy_json()
+        exit()
+
     if not SERPER_KEY:
         print("❌ SERPER_KEY is missing in .env file")
         exit()
@@ -117,10 +275,8 @@ if __name__ == "__main__":
     companies = load_companies()
     queries = generate_linkedin_queries(companies)
 
-    all_results, failed_queries = load_previous_results()
-
     # Determine queries to run
-    processed_queries = {q['query'] for q in all_results + failed_queries}
+    processed_queries, result_count, failed_count = load_previous_results()
     queries_to_run = [q for q in queries if q['query'] not in processed_queries]
 
     # Apply max queries limit
@@ -128,23 +284,9 @@ if __name__ == "__main__":
 
     print(f"\n🔍 Total queries to run this session: {len(queries_to_run)}\n")
 
-    for i, q in enumerate(queries_to_run, start=1):
-        print(f"🔎 [{i}/{len(queries_to_run)}] Searching: {q['query']}")
-        profiles = search_linkedin_profiles(q)
-        if profiles:
-            all_results.extend(profiles)
-            print(f"✅ Found {len(profiles)} profiles.")
-        else:
-            failed_queries.append(q)
-            print("⚠️ No results found.")
-
-        # Save partial results after each query
-        with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-            json.dump(all_results, f, indent=2)
-        with open(NO_RESULTS_JSON, "w", encoding="utf-8") as f:
-            json.dump(failed_queries, f, indent=2)
-
-        time.sleep(2)  # avoid rate limits
-
-    print(f"\n✔ Done. Saved {len(all_results)} results to '{OUTPUT_JSON}'.")
-    print(f"❌ {len(failed_queries)} queries failed. Saved to '{NO_RESULTS_JSON}'.")
+    # Queries run concurrently; pacing comes from the client's rate limiter (SERPER_QPS)
+    found, failed = asyncio.run(run_queries(queries_to_run))
+    export_legacy_json()
+
+    print(f"\n✔ Done. Saved {result_count + found} results to '{OUTPUT_JSON}'.")
+    print(f"❌ {failed_count + failed} queries failed. Saved to '{NO_RESULTS_JSON}'.")
@@ -1,91 +1,324 @@
-import requests
+import asyncio
+import contextlib
+import functools
+import html
+import httpx
 from bs4 import BeautifulSoup
 import pandas as pd
 import json
 import time
 import re
-from urllib.parse import urlparse
+import os
+from urllib.parse import urljoin, urlparse
+
+from html_scan import LinkedInLinkScanner, CompanySizeScanner, new_parser, scan_text
+from page_cache import PageCache
 
 INPUT_CSV = "naukri_with_websites.csv"
 OUTPUT_JSON = "company_linkedin_pages.json"
 
-def extract_linkedin_from_website(url):
+MAX_CONCURRENCY = 32  # requests in flight across all hosts
+PER_HOST_CONCURRENCY = 2  # requests in flight to any single host
+PER_HOST_DELAY = 1.0  # min seconds between request starts to the same host
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 10
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+SKIP_WEBSITES = ["n/a", "not found (only job/social links)", "error"]
+USE_PAGE_CACHE = os.getenv("USE_PAGE_CACHE", "1") != "0"  # share website downloads with company_enricher_it.py
+FAST_EXTRACTION = True  # streaming lxml scan that stops at the first match instead of a full BeautifulSoup tree
+MAX_PAGE_BYTES = 2_000_000  # stop reading any page after this many bytes
+# With USE_PAGE_CACHE the website pages are downloaded whole (up to MAX_PAGE_BYTES) so the
+# cache can serve them to company_enricher_it.py; stopping at the first LinkedIn link only
+# applies with USE_PAGE_CACHE=0 and to LinkedIn size pages.
+MAX_LINKEDIN_LINKS = 1  # fast path stops after this many company links (only the first is used downstream)
+
+# 🔹 Discovery: many sites only link LinkedIn from their contact/about pages
+DISCOVER_PAGES = True  # also try likely paths and sitemap pages, not just the homepage
+DISCOVERY_PATHS = ["/contact", "/contact-us", "/about", "/about-us"]
+USE_SITEMAP = True
+SITEMAP_KEYWORDS = ("contact", "about", "company", "team")  # sitemap URLs worth scanning
+SITEMAP_PAGES = 2  # sitemap pages tried per company
+SITEMAP_MAX_BYTES = 500_000
+MAX_REQUESTS_PER_COMPANY = 8
+MAX_BYTES_PER_COMPANY = 4_000_000
+SITEMAP_LOC_RE = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+DECODED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}  # no longer true of a re-wrapped body
+
+class BudgetExhausted(Exception):
+    pass
+
+class CrawlBudget:
+    """Request and byte allowance shared by the discovery fetches of one company."""
+
+    def __init__(self, max_requests=MAX_REQUESTS_PER_COMPANY, max_bytes=MAX_BYTES_PER_COMPANY):
+        self.requests_left = max_requests
+        self.bytes_left = max_bytes
+
+    def charge(self, max_bytes):
+        """Take one request; returns the byte cap for it or raises BudgetExhausted."""
+        if self.requests_left <= 0 or self.bytes_left <= 0:
+            raise BudgetExhausted()
+        self.requests_left -= 1
+        return min(max_bytes, self.bytes_left)
+
+    def spend(self, nbytes):
+        self.bytes_left -= nbytes
+
+async def read_body(resp, max_bytes):
+    """(decoded body of a streamed response cut at max_bytes, whether it was cut)."""
+    body = b""
+    async for chunk in resp.aiter_bytes():
+        body += chunk
+        if len(body) > max_bytes:
+            return body[:max_bytes], True
+    return body, False
+
+def site_host(url):
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+class PoliteClient:
+    """Shared httpx pool with a global concurrency cap and per-host concurrency/delay limits."""
+
+    def __init__(self, concurrency=MAX_CONCURRENCY, per_host=PER_HOST_CONCURRENCY, host_delay=PER_HOST_DELAY):
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+        self.http = httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=timeout, follow_redirects=True)
+        self.global_slots = asyncio.Semaphore(concurrency)
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.host_slots = {}
+        self.host_locks = {}
+        self.next_start = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.http.aclose()
+
+    @contextlib.asynccontextmanager
+    async def host_slot(self, url):
+        host = site_host(url)
+        async with self.host_slots.setdefault(host, asyncio.Semaphore(self.per_host)):
+            async with self.host_locks.setdefault(host, asyncio.Lock()):
+                wait = self.next_start.get(host, 0) - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.next_start[host] = time.monotonic() + self.host_delay
+            yield
+
+    async def get(self, url, headers=None, budget=None, max_bytes=MAX_PAGE_BYTES):
+        """GET url reading at most max_bytes of the body; returns a plain httpx.Response.
+
+        A body cut at the cap is flagged with `truncated = True` so PageCache won't store it.
+        """
+        async with self.host_slot(url), self.global_slots:
+            if budget:
+                max_bytes = budget.charge(max_bytes)
+            async with self.http.stream("GET", url, headers=headers) as resp:
+                body, truncated = await read_body(resp, max_bytes)
+            if budget:
+                budget.spend(len(body))
+            headers = [(k, v) for k, v in resp.headers.multi_items() if k.lower() not in DECODED_HEADERS]
+            response = httpx.Response(resp.status_code, headers=headers, content=body, request=resp.request)
+            response.truncated = truncated
+            return response
+
+    async def scan(self, url, target, max_bytes=MAX_PAGE_BYTES, budget=None):
+        """Stream url into an html_scan target until it is done or max_bytes are read.
+
+        Returns the target's result, or None for a non-200 response.
+        """
+        async with self.host_slot(url), self.global_slots:
+            if budget:
+                max_bytes = budget.charge(max_bytes)
+            async with self.http.stream("GET", url) as resp:
+                if resp.status_code != 200:
+                    return None
+                parser = new_parser(target, resp.charset_encoding)
+                read = 0
+                async for chunk in resp.aiter_bytes():
+                    parser.feed(chunk)
+                    read += len(chunk)
+                    if target.done or read >= max_bytes:
+                        break
+                if budget:
+                    budget.spend(read)
+                return parser.close()
+
+    async def read(self, url, max_bytes=MAX_PAGE_BYTES, budget=None):
+        """Body of url as text, truncated after max_bytes; None for a non-200 response."""
+        async with self.host_slot(url), self.global_slots:
+            if budget:
+                max_bytes = budget.charge(max_bytes)
+            async with self.http.stream("GET", url) as resp:
+                if resp.status_code != 200:
+                    return None
+                body, _ = await read_body(resp, max_bytes)
+                if budget:
+                    budget.spend(len(body))
+                return body.decode(resp.charset_encoding or "utf-8", errors="replace")
+
+def find_linkedin_links(html):
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if "linkedin.com/company" in href:
+            href = href.split("?")[0]
+            if href not in links:
+                links.append(href)
+    return links
+
+def parse_company_size(html):
+    soup = BeautifulSoup(html, "html.parser")
+    text = soup.get_text(" ", strip=True)
+    match = re.search(r"([\d,]+)\s+employees", text, re.IGNORECASE)
+    if match:
+        number = match.group(1).replace(",", "")
+        return int(number)
+    return None
+
+async def extract_linkedin_from_website(client, url, cache=None, budget=None):
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=10)
+        if FAST_EXTRACTION and not cache:
+            return await client.scan(url, LinkedInLinkScanner(MAX_LINKEDIN_LINKS), budget=budget) or []
+        get = functools.partial(client.get, budget=budget, max_bytes=MAX_PAGE_BYTES)
+        resp = await (cache.fetch(get, url) if cache else get(url))
         if resp.status_code != 200:
             return []
-        soup = BeautifulSoup(resp.text, "html.parser")
-        links = []
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if "linkedin.com/company" in href:
-                href = href.split("?")[0]
-                if href not in links:
-                    links.append(href)
-        return links
+        if FAST_EXTRACTION:
+            return scan_text(resp.text, LinkedInLinkScanner(MAX_LINKEDIN_LINKS))
+        return find_linkedin_links(resp.text)
+    except BudgetExhausted:
+        return []
     except Exception as e:
         print(f"⚠️ Error crawling {url}: {e}")
         return []
 
-def extract_company_size(linkedin_url):
+async def extract_company_size(client, linkedin_url):
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(linkedin_url, headers=headers, timeout=10)
+        if FAST_EXTRACTION:
+            return await client.scan(linkedin_url, CompanySizeScanner())
+        resp = await client.get(linkedin_url)
         if resp.status_code != 200:
             return None
-        soup = BeautifulSoup(resp.text, "html.parser")
-        text = soup.get_text(" ", strip=True)
-        match = re.search(r"([\d,]+)\s+employees", text, re.IGNORECASE)
-        if match:
-            number = match.group(1).replace(",", "")
-            return int(number)
-        return None
+        return parse_company_size(resp.text)
     except Exception as e:
         print(f"⚠️ Error fetching size from {linkedin_url}: {e}")
         return None
 
-# Load CSV
-df = pd.read_csv(INPUT_CSV)
-if "website" not in df.columns or "company" not in df.columns:
-    raise ValueError("❌ CSV must have 'website' and 'company' columns")
-
-results = []
-
-websites_df = df[["company", "website"]].dropna().drop_duplicates()
-websites_list = websites_df.to_dict(orient="records")
-
-for idx, row in enumerate(websites_list, 1):
-    website = str(row["website"]).strip()
-    company_name = row["company"].strip()
-    
-    if not website or website.lower() in ["n/a", "not found (only job/social links)", "error"]:
-        continue
-    
-    if not website.startswith("http"):
-        website = "https://" + website
-    
-    print(f"🔎 ({idx}/{len(websites_list)}) Crawling {website}")
-    
-    linkedin_urls = extract_linkedin_from_website(website)
-    
+async def sitemap_pages(client, website, budget):
+    """Contact/about-looking URLs on the same site listed in its sitemap.xml."""
+    try:
+        xml = await client.read(urljoin(website, "/sitemap.xml"), SITEMAP_MAX_BYTES, budget)
+    except Exception:
+        return []
+    urls = []
+    for loc in SITEMAP_LOC_RE.findall(xml or ""):
+        loc = html.unescape(loc)
+        path = urlparse(loc).path.lower()
+        if site_host(loc) == site_host(website) and any(k in path for k in SITEMAP_KEYWORDS) and loc not in urls:
+            urls.append(loc)
+    return urls[:SITEMAP_PAGES]
+
+async def scan_page(client, url, cache, budget):
+    return await extract_linkedin_from_website(client, url, cache, budget), url
+
+async def scan_sitemap(client, website, cache, budget, skip):
+    for url in await sitemap_pages(client, website, budget):
+        if url not in skip:
+            links = await extract_linkedin_from_website(client, url, cache, budget)
+            if links:
+                return links, url
+    return [], None
+
+async def discover_linkedin_links(client, website, cache=None):
+    """Scan the homepage, likely contact/about paths and sitemap pages concurrently.
+
+    Candidates are ranked in that order and awaited by rank: the first ranked
+    hit wins and every lower-ranked fetch still pending is cancelled, so the
+    answer doesn't depend on which response arrived first. All fetches share
+    one CrawlBudget. Returns (links, page_url).
+    """
+    budget = CrawlBudget()
+    urls = [website]
+    for path in DISCOVERY_PATHS:
+        url = urljoin(website, path)
+        if url not in urls:
+            urls.append(url)
+    coros = [scan_page(client, url, cache, budget) for url in urls]
+    if USE_SITEMAP:
+        coros.append(scan_sitemap(client, website, cache, budget, urls))
+
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        for task in tasks:
+            links, url = await task
+            if links:
+                return links, url
+        return [], website
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def load_websites():
+    df = pd.read_csv(INPUT_CSV)
+    if "website" not in df.columns or "company" not in df.columns:
+        raise ValueError("❌ CSV must have 'website' and 'company' columns")
+
+    websites_df = df[["company", "website"]].dropna().drop_duplicates()
+    rows = []
+    for row in websites_df.to_dict(orient="records"):
+        website = str(row["website"]).strip()
+        if not website or website.lower() in SKIP_WEBSITES:
+            continue
+        if not website.startswith("http"):
+            website = "https://" + website
+        rows.append({"company_name": row["company"].strip(), "website": website})
+    return rows
+
+async def crawl_company(client, cache, row):
+    website = row["website"]
+    if DISCOVER_PAGES:
+        linkedin_urls, source_url = await discover_linkedin_links(client, website, cache)
+    else:
+        linkedin_urls, source_url = await extract_linkedin_from_website(client, website, cache), website
+
     company_size = None
     if linkedin_urls:
-        company_size = extract_company_size(linkedin_urls[0])
-    
-    results.append({
-        "company_name": company_name,
+        company_size = await extract_company_size(client, linkedin_urls[0])
+
+    print(f"✅ {website}: {len(linkedin_urls)} LinkedIn URLs, Company Size: {company_size}")
+    return {
+        "company_name": row["company_name"],
         "website": website,
         "linkedin_urls": linkedin_urls,
         "company_size": company_size,
-        "source_url": website
-    })
-    
-    print(f"✅ Found {len(linkedin_urls)} LinkedIn URLs, Company Size: {company_size}")
-    time.sleep(1)  # avoid hammering servers
+        "source_url": source_url
+    }
+
+async def crawl_all(rows):
+    """Crawl every company concurrently; results keep the input order."""
+    cache = PageCache() if USE_PAGE_CACHE else None
+    try:
+        async with PoliteClient() as client:
+            return await asyncio.gather(*(crawl_company(client, cache, row) for row in rows))
+    finally:
+        if cache:
+            cache.close()
+
+def main():
+    rows = load_websites()
+    print(f"🔎 Crawling {len(rows)} company websites")
+    results = asyncio.run(crawl_all(rows))
+
+    # Save enhanced JSON
+    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
 
-# Save enhanced JSON
-with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-    json.dump(results, f, indent=2)
+    print(f"\n✔ Done. Saved results to '{OUTPUT_JSON}'")
 
-print(f"\n✔ Done. Saved results to '{OUTPUT_JSON}'")
+if __name__ == "__main__":
+    main()
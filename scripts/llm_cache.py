@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+LLM_CACHE_FILE = os.getenv("LLM_CACHE_FILE", "llm_cache.sqlite")
+
+def llm_cache_key(model, system_prompt, name, website_text) -> str:
+    """Hash of everything that decides the answer; a new model or prompt means new keys."""
+    blob = json.dumps([
+        model,
+        system_prompt,
+        " ".join(str(name or "").lower().split()),
+        " ".join(str(website_text or "").split())
+    ], ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """SQLite store of LLM enrichment results, with lifetime hit and tokens-saved counters."""
+
+    def __init__(self, path=LLM_CACHE_FILE):
+        self.lookups = 0
+        self.hits = 0
+        self.tokens_saved = 0
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, name TEXT, response TEXT, tokens INTEGER, "
+            "hits INTEGER DEFAULT 0, created REAL, accessed REAL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+
+    def get(self, key):
+        """Cached response dict for key, or None."""
+        self.lookups += 1
+        row = self.db.execute("SELECT response, tokens FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE responses SET hits = hits + 1, accessed = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        self.tokens_saved += row[1] or 0
+        return json.loads(row[0])
+
+    def put(self, key, model, name, response: dict, tokens: int):
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses (key, model, name, response, tokens, hits, created, accessed) "
+            "VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+            (key, model, name, json.dumps(response, ensure_ascii=False), tokens or 0, now, now)
+        )
+
+    def stats(self):
+        """Lifetime totals, including this session's counters."""
+        counters = dict(self.db.execute("SELECT name, value FROM counters").fetchall())
+        entries, tokens_stored = self.db.execute("SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM responses").fetchone()
+        lookups = counters.get("lookups", 0) + self.lookups
+        hits = counters.get("hits", 0) + self.hits
+        return {
+            "entries": entries,
+            "tokens_stored": tokens_stored,
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "tokens_saved": counters.get("tokens_saved", 0) + self.tokens_saved
+        }
+
+    def close(self):
+        for name in ("lookups", "hits", "tokens_saved"):
+            self.db.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, getattr(self, name))
+            )
+        self.lookups = self.hits = self.tokens_saved = 0
+        self.db.close()
+
+def print_stats(path=LLM_CACHE_FILE):
+    cache = LLMCache(path)
+    stats = cache.stats()
+    cache.close()
+    print(f"🗄️ {stats['entries']} cached responses ({stats['tokens_stored']:,} tokens when first generated)")
+    print(f"🎯 {stats['hits']}/{stats['lookups']} lookups hit ({stats['hit_rate']:.1%})")
+    print(f"💰 {stats['tokens_saved']:,} tokens saved")
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["stats"]:
+        print_stats()
+    else:
+        print("Usage: python llm_cache.py stats")
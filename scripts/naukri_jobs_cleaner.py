@@ -1,8 +1,16 @@
+import collections
 import csv
+import functools
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
 
 INPUT_FILE = "naukri_jobs.csv"
 OUTPUT_FILE = "naukri_jobs_clean.csv"
+CLEAN_MODE = os.getenv("CLEAN_MODE", "rows")  # "rows" (csv module) or "columnar" (pandas chunks, for big exports)
+CHUNK_ROWS = 200_000
+CLEAN_WORKERS = int(os.getenv("CLEAN_WORKERS", "1"))  # processes cleaning chunks in columnar mode
 
 CITY_PATTERNS = [
     "Mumbai", "Navi Mumbai", "Thane", "Pune", "Delhi", "Noida", "Gurgaon",
@@ -20,6 +28,34 @@ JUNK_KEYWORDS = [
 
 LEFTOVER_FRAGMENTS = ["Navi", "Ncr", "All Areas", "Hybrid", "Remote"]
 
+CLEAN_CACHE_SIZE = 200_000  # distinct (company, title) pairs remembered
+
+def keyword_regex(words):
+    """One whole-word, case-insensitive alternation equivalent to removing `words` one by one, in order.
+
+    A word that contains an earlier word (at word boundaries) can never match
+    once that earlier word has been removed, so it is left out; the remaining
+    words don't overlap, which makes a single left-to-right pass give the
+    same result as the sequential re.sub loop.
+    """
+    kept = []
+    for word in words:
+        if not any(re.search(rf"\b{re.escape(k)}\b", word, re.IGNORECASE) for k in kept):
+            kept.append(word)
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in kept) + r")\b", re.IGNORECASE)
+
+KEYWORDS_RE = keyword_regex(JUNK_KEYWORDS + CITY_PATTERNS + LEFTOVER_FRAGMENTS)
+RANGE_RE = re.compile(r"\b\d+\s*To\s*(\d+)?\b", re.IGNORECASE)
+PARENS_RE = re.compile(r"\(.*?\)")
+DASH_TAIL_RE = re.compile(r"\s*-\s*.*$")
+SPACES_RE = re.compile(r"\s{2,}")
+DOUBLE_COMMA_RE = re.compile(r",\s*,")
+
+@functools.lru_cache(maxsize=4096)
+def title_regex(job_title):
+    return re.compile(re.escape(job_title), re.IGNORECASE)
+
+@functools.lru_cache(maxsize=CLEAN_CACHE_SIZE)
 def clean_company_name(company_raw, job_title=None):
     if not company_raw:
         return "Unknown"
@@ -27,48 +63,112 @@ def clean_company_name(company_raw, job_title=None):
     text = company_raw.strip()
 
     if job_title:
-        text = re.sub(re.escape(job_title), "", text, flags=re.IGNORECASE)
+        text = title_regex(job_title).sub("", text)
 
-    for kw in JUNK_KEYWORDS:
-        text = re.sub(rf"\b{kw}\b", "", text, flags=re.IGNORECASE)
-
-    for city in CITY_PATTERNS:
-        text = re.sub(rf"\b{re.escape(city)}\b", "", text, flags=re.IGNORECASE)
-
-    for frag in LEFTOVER_FRAGMENTS:
-        text = re.sub(rf"\b{frag}\b", "", text, flags=re.IGNORECASE)
-
-    text = re.sub(r"\b\d+\s*To\s*(\d+)?\b", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\(.*?\)", "", text)
-    text = re.sub(r"\s*-\s*.*$", "", text)
-    text = re.sub(r"\s{2,}", " ", text).strip()
+    text = KEYWORDS_RE.sub("", text)
+    text = RANGE_RE.sub("", text)
+    text = PARENS_RE.sub("", text)
+    text = DASH_TAIL_RE.sub("", text)
+    text = SPACES_RE.sub(" ", text).strip()
 
     return text if text else "Unknown"
 
+@functools.lru_cache(maxsize=CLEAN_CACHE_SIZE)
 def clean_location(location_raw):
     if not location_raw:
         return "Unknown"
     # Remove parentheses and extra spaces
-    text = re.sub(r"\(.*?\)", "", location_raw).strip()
+    text = PARENS_RE.sub("", location_raw).strip()
     # Collapse multiple commas/spaces
-    text = re.sub(r"\s{2,}", " ", text)
-    text = re.sub(r",\s*,", ",", text)
+    text = SPACES_RE.sub(" ", text)
+    text = DOUBLE_COMMA_RE.sub(",", text)
     return text if text else "Unknown"
 
-with open(INPUT_FILE, newline="", encoding="utf-8") as infile, \
-     open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as outfile:
-
-    reader = csv.DictReader(infile)
-    fieldnames = reader.fieldnames
-    writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-    writer.writeheader()
-
-    for row in reader:
-        row["company"] = clean_company_name(
-            row.get("company", ""),
-            job_title=row.get("title", "")
-        )
-        row["location"] = clean_location(row.get("location", ""))
-        writer.writerow(row)
-
-print(f"✅ Final cleaned CSV saved to {OUTPUT_FILE}")
+def clean_csv(input_path=INPUT_FILE, output_path=OUTPUT_FILE, clean_company=clean_company_name):
+    with open(input_path, newline="", encoding="utf-8") as infile, \
+         open(output_path, "w", newline="", encoding="utf-8") as outfile:
+
+        reader = csv.DictReader(infile)
+        fieldnames = reader.fieldnames
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for row in reader:
+            row["company"] = clean_company(
+                row.get("company", ""),
+                job_title=row.get("title", "")
+            )
+            row["location"] = clean_location(row.get("location", ""))
+            writer.writerow(row)
+
+# ==============================
+# COLUMNAR MODE
+# ==============================
+def clean_company_column(companies, titles):
+    """clean_company_name over aligned company/title Series, run once per distinct pair."""
+    pairs = pd.DataFrame({"company": companies, "title": titles}).astype(object)
+    unique = pairs.drop_duplicates(ignore_index=True)
+    text = unique["company"].str.strip()
+
+    # The job title differs per row, so its removal can't be one column-wide pattern
+    has_title = (unique["title"] != "").to_numpy()
+    text[has_title] = [title_regex(t).sub("", c) for c, t in zip(text[has_title], unique["title"][has_title])]
+
+    for pattern in (KEYWORDS_RE, RANGE_RE, PARENS_RE, DASH_TAIL_RE):
+        text = text.str.replace(pattern, "", regex=True)
+    text = text.str.replace(SPACES_RE, " ", regex=True).str.strip()
+    unique["clean"] = text.where((text != "") & (unique["company"] != ""), "Unknown")
+    return pairs.merge(unique, on=["company", "title"], how="left")["clean"].to_numpy()
+
+def clean_location_column(locations):
+    """clean_location over a Series, run once per distinct value."""
+    raw = pd.Series(locations.unique(), dtype=object)
+    text = raw.str.replace(PARENS_RE, "", regex=True).str.strip()
+    text = text.str.replace(SPACES_RE, " ", regex=True).str.replace(DOUBLE_COMMA_RE, ",", regex=True)
+    text = text.where((text != "") & (raw != ""), "Unknown")
+    return locations.map(dict(zip(raw, text))).to_numpy()
+
+def clean_chunk(chunk):
+    titles = chunk["title"] if "title" in chunk else pd.Series("", index=chunk.index)
+    chunk["company"] = clean_company_column(chunk["company"], titles)
+    chunk["location"] = clean_location_column(chunk["location"])
+    return chunk
+
+def clean_csv_columnar(input_path=INPUT_FILE, output_path=OUTPUT_FILE, chunk_rows=CHUNK_ROWS, workers=CLEAN_WORKERS):
+    """Same output as clean_csv, cleaning pandas chunks column-wise (optionally across processes).
+
+    Everything is read as text with no NA parsing and written with csv's CRLF
+    line endings, so the file matches the row-wise path byte for byte.
+    """
+    chunks = pd.read_csv(input_path, dtype=str, keep_default_na=False, chunksize=chunk_rows, encoding="utf-8")
+    with open(output_path, "w", newline="", encoding="utf-8") as outfile:
+        def write(chunk, first):
+            chunk.to_csv(outfile, index=False, header=first, lineterminator="\r\n")
+
+        if workers <= 1:
+            for i, chunk in enumerate(chunks):
+                write(clean_chunk(chunk), i == 0)
+            return
+
+        # Keep a bounded window of chunks in flight and write them back in order
+        with ProcessPoolExecutor(workers) as pool:
+            pending = collections.deque()
+            written = 0
+            for chunk in chunks:
+                pending.append(pool.submit(clean_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().result(), written == 0)
+                    written += 1
+            while pending:
+                write(pending.popleft().result(), written == 0)
+                written += 1
+
+def main():
+    if CLEAN_MODE == "columnar":
+        clean_csv_columnar()
+    else:
+        clean_csv()
+    print(f"✅ Final cleaned CSV saved to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import re
+import lxml.html
+
+# lxml counterparts of the CSS selectors used by the Playwright backend in
+# scrape_naukri.py; keep both in sync so the two backends emit the same rows.
+
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "footer",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "tr", "ul"
+}
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+CARD_XPATH = f"//*[{_has_class('jobTuple')} or {_has_class('cust-job-tuple')}]"
+TITLE_XPATH = f".//a[{_has_class('title')}]"
+LOCATION_XPATH = f".//*[{_has_class('locWdth')} or {_has_class('location')}]"
+CARD_COMPANY_XPATH = (
+    f".//*[{_has_class('company')}]//a | .//*[{_has_class('company')}]//span"
+    f" | .//*[{_has_class('subTitle')}] | .//*[{_has_class('jd-header-comp-name')}]"
+)
+NO_RESULTS_XPATH = f"//*[{_has_class('no-result-found')} or {_has_class('noResultsFound')} or {_has_class('nrf-container')}]"
+JOB_COUNT_RE = re.compile(r'"noOfJobs"\s*:\s*(\d+)')  # total results in the page's hydration JSON
+JOBS_PER_PAGE = 20
+ABOUT_XPATHS = [
+    f"//section[{_has_class('about-company')}]",
+    f"//*[{_has_class('job-desc-about-company')}]",
+    f"//*[{_has_class('jd-header-comp-name')}]",
+    f"//div[{_has_class('aboutCompany')}]//div[not(preceding-sibling::*)]",
+]
+
+def inner_text(el) -> str:
+    """Approximate the browser's innerText: one line per block, collapsed spaces."""
+    parts = []
+
+    def walk(node):
+        tag = node.tag if isinstance(node.tag, str) else ""
+        if tag not in SKIP_TAGS and tag:
+            block = tag in BLOCK_TAGS
+            if block:
+                parts.append("\n")
+            if tag == "br":
+                parts.append("\n")
+            if node.text:
+                parts.append(node.text.replace("\n", " "))
+            for child in node:
+                walk(child)
+            if block:
+                parts.append("\n")
+        if node is not el and node.tail:
+            parts.append(node.tail.replace("\n", " "))
+
+    walk(el)
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def _first(el, xpath):
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+def parse_listing_cards(html: str) -> list:
+    """Extract job cards from listing-page HTML, in page order."""
+    if not html.strip():
+        return []
+    doc = lxml.html.fromstring(html)
+    cards = []
+    for job in doc.xpath(CARD_XPATH):
+        title_el = _first(job, TITLE_XPATH)
+        location_el = _first(job, LOCATION_XPATH)
+        company_el = _first(job, CARD_COMPANY_XPATH)
+        cards.append({
+            "title": inner_text(title_el) if title_el is not None else "",
+            "link": (title_el.get("href") or "") if title_el is not None else "",
+            "location": inner_text(location_el) if location_el is not None else "",
+            "card_company": inner_text(company_el) if company_el is not None else ""
+        })
+    return cards
+
+def listing_has_no_results(html: str, page_number: int) -> bool:
+    """True when a listing page is genuinely past the end of the results, as opposed
+    to HTML whose cards we failed to find (blocked, half-rendered or a changed layout)."""
+    match = JOB_COUNT_RE.search(html)
+    if match:
+        return (page_number - 1) * JOBS_PER_PAGE >= int(match.group(1))
+    if not html.strip():
+        return False
+    return bool(lxml.html.fromstring(html).xpath(NO_RESULTS_XPATH))
+
+def parse_about_text(html: str) -> str:
+    """Return the about-company text of a job detail page ('' when absent)."""
+    if not html.strip():
+        return ""
+    doc = lxml.html.fromstring(html)
+    about_text = ""
+    for xpath in ABOUT_XPATHS:
+        el = _first(doc, xpath)
+        if el is not None:
+            about_text = inner_text(el)
+            if about_text.strip():
+                break
+    return about_text
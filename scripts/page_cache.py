@@ -0,0 +1,172 @@
+import collections
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", "page_cache")
+PAGE_CACHE_TTL_HOURS = float(os.getenv("PAGE_CACHE_TTL_HOURS", "168"))  # served without revalidation
+PAGE_CACHE_MAX_MB = float(os.getenv("PAGE_CACHE_MAX_MB", "500"))  # compressed bodies on disk
+EVICT_EVERY = 200  # stores between eviction sweeps
+
+Page = collections.namedtuple("Page", ["status_code", "text", "from_cache"])
+
+class PageCache:
+    """Content-addressed on-disk cache of web pages shared by the website crawlers.
+
+    Bodies are stored gzip-compressed under their SHA-256, so identical pages
+    share one file. A SQLite index maps each URL to its body together with the
+    ETag/Last-Modified validators used for conditional GETs once the entry is
+    older than the TTL. Least recently used pages are evicted past max size.
+    """
+
+    def __init__(self, directory=PAGE_CACHE_DIR, ttl_hours=PAGE_CACHE_TTL_HOURS, max_mb=PAGE_CACHE_MAX_MB):
+        self.directory = directory
+        self.ttl = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.stores = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(directory, "index.sqlite"), isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, hash TEXT, encoding TEXT, etag TEXT, last_modified TEXT, "
+            "fetched REAL, accessed REAL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS bodies (hash TEXT PRIMARY KEY, size INTEGER)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed)")
+
+    def _body_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest + ".gz")
+
+    def lookup(self, url):
+        """Index row for url as a dict (with `fresh` and `text`), or None when not cached."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT hash, encoding, etag, last_modified, fetched FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        digest, encoding, etag, last_modified, fetched = row
+        try:
+            with gzip.open(self._body_path(digest), "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        return {
+            "text": body.decode(encoding or "utf-8", errors="replace"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": time.time() - fetched < self.ttl
+        }
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url, revalidated=False):
+        now = time.time()
+        with self.lock:
+            if revalidated:
+                self.db.execute("UPDATE pages SET fetched = ?, accessed = ? WHERE url = ?", (now, now, url))
+            else:
+                self.db.execute("UPDATE pages SET accessed = ? WHERE url = ?", (now, url))
+
+    def store(self, url, content, encoding, headers):
+        """Save a 200 response body (bytes) with its validators."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._body_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        now = time.time()
+        with self.lock:
+            previous = self.db.execute("SELECT hash FROM pages WHERE url = ?", (url,)).fetchone()
+            self.db.execute("INSERT OR IGNORE INTO bodies (hash, size) VALUES (?, ?)", (digest, os.path.getsize(path)))
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages (url, hash, encoding, etag, last_modified, fetched, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, encoding, headers.get("etag"), headers.get("last-modified"), now, now)
+            )
+            if previous and previous[0] != digest:
+                self._drop_unused_body(previous[0])  # the page changed; its old body may now be unreferenced
+            self.stores += 1
+            due = self.stores % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def _drop_unused_body(self, digest):
+        """Delete a body no page points at any more; returns the bytes freed. Caller holds the lock."""
+        if self.db.execute("SELECT 1 FROM pages WHERE hash = ? LIMIT 1", (digest,)).fetchone() is not None:
+            return 0
+        size = self.db.execute("SELECT size FROM bodies WHERE hash = ?", (digest,)).fetchone()
+        self.db.execute("DELETE FROM bodies WHERE hash = ?", (digest,))
+        try:
+            os.remove(self._body_path(digest))
+        except OSError:
+            pass
+        return size[0] if size else 0
+
+    def evict(self):
+        """Drop orphaned bodies, then least recently used pages until the bodies fit in max size (with 10% headroom)."""
+        with self.lock:
+            orphans = self.db.execute("SELECT hash FROM bodies WHERE hash NOT IN (SELECT hash FROM pages)").fetchall()
+            for (digest,) in orphans:
+                self._drop_unused_body(digest)
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            target = self.max_bytes * 0.9
+            for url, digest in self.db.execute("SELECT url, hash FROM pages ORDER BY accessed").fetchall():
+                self.db.execute("DELETE FROM pages WHERE url = ?", (url,))
+                total -= self._drop_unused_body(digest)
+                if total <= target:
+                    break
+
+    def close(self):
+        self.evict()
+        self.db.close()
+
+    # Fetch helpers: serve fresh entries from disk, revalidate stale ones with a
+    # conditional GET (304 keeps the cached body) and store new 200 responses.
+
+    async def fetch(self, get, url):
+        """Async fetch through the cache; `get(url, headers)` must return an httpx.Response."""
+        entry = self.lookup(url)
+        if entry and entry["fresh"]:
+            self.touch(url)
+            return Page(200, entry["text"], True)
+        resp = await get(url, self.conditional_headers(entry))
+        if getattr(resp, "truncated", False):
+            return Page(resp.status_code, resp.text, False)  # cut off by a byte cap: never cache a partial page
+        return self._handle_response(url, entry, resp.status_code, resp.content, resp.encoding, resp.headers, resp.text)
+
+    def fetch_sync(self, get, url):
+        """Blocking twin of fetch(); `get(url, headers)` must return a requests.Response."""
+        entry = self.lookup(url)
+        if entry and entry["fresh"]:
+            self.touch(url)
+            return Page(200, entry["text"], True)
+        resp = get(url, self.conditional_headers(entry))
+        encoding = resp.encoding or resp.apparent_encoding
+        return self._handle_response(url, entry, resp.status_code, resp.content, encoding, resp.headers, resp.text)
+
+    def _handle_response(self, url, entry, status_code, content, encoding, headers, text):
+        if status_code == 304 and entry:
+            self.touch(url, revalidated=True)
+            return Page(200, entry["text"], True)
+        if status_code == 200:
+            self.store(url, content, encoding, headers)
+        return Page(status_code, text, False)
@@ -1,6 +1,14 @@
 import json
+import os
 import pandas as pd
 
+from company_resolver import CompanyIndex
+
+try:
+    import ijson  # streams the profiles array instead of loading it whole
+except ImportError:
+    ijson = None
+
 # Input files
 PROFILES_FILE = "linkedin_results_cleaned.json"   # output of profile_cleaner_v2
 COMPANIES_FILE = "company_linkedin_pages.json"   # from linkedin_search.py
@@ -8,50 +16,128 @@ COMPANIES_FILE = "company_linkedin_pages.json"   # from linkedin_search.py
 # Output files
 OUTPUT_JSON = "linkedin_profiles_final.json"
 OUTPUT_CSV = "linkedin_profiles_final.csv"
+OUTPUT_PARQUET = os.getenv("OUTPUT_PARQUET", "")  # e.g. linkedin_profiles_final.parquet (needs pyarrow)
+RESOLUTION_REPORT = "company_resolution_merger.json"  # fuzzy matches and ambiguous names to review
+CHUNK_ROWS = 20_000  # profiles joined and written at a time
+
+PROFILE_COLUMNS = ["query", "title", "url", "roles", "company"]
+OUTPUT_COLUMNS = PROFILE_COLUMNS + ["company_website", "company_size", "company_linkedin_url"]
+REQUIRED_COMPANY_COLUMNS = ["company_name", "website", "company_size"]  # plus linkedin_urls, as linkedin_search.py writes
 
 def load_json(path):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def iter_profile_chunks(path, chunk_rows=CHUNK_ROWS):
+    """DataFrames of up to chunk_rows profiles, keeping only the columns the merge needs."""
+    with open(path, "rb") as f:
+        records = ijson.items(f, "item", use_float=True) if ijson else iter(json.load(f))
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == chunk_rows:
+                yield pd.DataFrame.from_records(batch, columns=PROFILE_COLUMNS)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=PROFILE_COLUMNS)
+
+def company_table(companies, source=COMPANIES_FILE):
+    """Company details by name, checked against the schema linkedin_search.py writes."""
+    columns = ["company_name", "company_website", "company_size", "company_linkedin_url"]
+    if not companies:
+        return pd.DataFrame(columns=columns, dtype=object)
+    table = pd.DataFrame(companies, dtype=object)
+    missing = [column for column in REQUIRED_COMPANY_COLUMNS if column not in table]
+    if "linkedin_urls" in table:
+        table["company_linkedin_url"] = table["linkedin_urls"].map(lambda urls: urls[0] if isinstance(urls, list) and urls else None)
+    elif "linkedin_url" in table:  # older company files
+        table["company_linkedin_url"] = table["linkedin_url"]
+    else:
+        missing.append("linkedin_urls")
+    if missing:
+        raise ValueError(f"❌ {source} is missing columns: {', '.join(missing)}")
+
+    table["company_name"] = table["company_name"].fillna("").astype(str).str.strip()
+    table = table.rename(columns={"website": "company_website"})
+    return table[columns].drop_duplicates("company_name", keep="last")
+
+def join_chunk(chunk, companies, index, known):
+    """Left-join one profiles chunk onto the company table (exact name first, then the resolver)."""
+    chunk["company"] = chunk["company"].fillna("").astype(str).str.strip()
+    canonical = {name: name if name in known else index.resolve(name) for name in chunk["company"].unique()}
+    chunk["company_name"] = chunk["company"].map(canonical)
+    joined = chunk.merge(companies, on="company_name", how="left")[OUTPUT_COLUMNS].astype(object)
+    return joined.where(joined.notna(), None)
+
+def encode_value(value, encode=json.JSONEncoder(ensure_ascii=False).encode):
+    if isinstance(value, (list, dict)) and value:
+        return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+    return encode(value)
+
+# One output record laid out exactly as json.dump(records, indent=2) would
+RECORD_TEMPLATE = "  {\n" + ",\n".join(f"    {json.dumps(c)}: %s" for c in OUTPUT_COLUMNS) + "\n  }"
+
+class TableWriter:
+    """Appends joined chunks to the JSON array, the CSV and optionally a Parquet file."""
+
+    def __init__(self, json_path, csv_path, parquet_path=None):
+        self.json_file = open(json_path, "w", encoding="utf-8")
+        self.csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+        self.parquet_path = parquet_path
+        self.parquet = None
+        self.rows = 0
+
+    def write(self, frame):
+        # Values are encoded column by column with the C encoder, then slotted into the record layout
+        columns = [list(map(encode_value, frame[column].tolist())) for column in OUTPUT_COLUMNS]
+        records = [RECORD_TEMPLATE % values for values in zip(*columns)]
+        if records:
+            self.json_file.write(("[\n" if self.rows == 0 else ",\n") + ",\n".join(records))
+            self.rows += len(records)
+        frame.to_csv(self.csv_file, index=False, header=self.csv_file.tell() == 0)
+        if self.parquet_path:
+            self.write_parquet(frame)
+
+    def write_parquet(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(column, pa.string()) for column in OUTPUT_COLUMNS if column != "company_size"]
+                           + [("company_size", pa.int64())])
+        frame = frame.assign(company_size=pd.to_numeric(frame["company_size"], errors="coerce").astype("Int64"))
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        if self.parquet is None:
+            self.parquet = pq.ParquetWriter(self.parquet_path, schema)
+        self.parquet.write_table(table)
+
+    def close(self):
+        self.json_file.write("\n]" if self.rows else "[]")
+        self.json_file.close()
+        self.csv_file.close()
+        if self.parquet:
+            self.parquet.close()
+
+def merge(profiles_path=PROFILES_FILE, companies_path=COMPANIES_FILE, json_path=OUTPUT_JSON, csv_path=OUTPUT_CSV,
+          parquet_path=OUTPUT_PARQUET, report_path=RESOLUTION_REPORT):
+    companies = company_table(load_json(companies_path), companies_path)
+    known = set(companies["company_name"])
+    # Exact names first, then the resolver for "Acme" vs "Acme Technologies Pvt Ltd" style variants
+    index = CompanyIndex(companies["company_name"])
+
+    writer = TableWriter(json_path, csv_path, parquet_path)
+    try:
+        for chunk in iter_profile_chunks(profiles_path):
+            writer.write(join_chunk(chunk, companies, index, known))
+    finally:
+        writer.close()
+    if report_path:
+        index.write_report(report_path)
+    return writer.rows
+
 def main():
-    # Load data
-    profiles = load_json(PROFILES_FILE)
-    companies = load_json(COMPANIES_FILE)
-
-    # Map company details
-    company_map = {
-        c.get("company_name", "").strip(): {
-            "company_website": c.get("website"),
-            "company_size": c.get("company_size"),
-            "company_linkedin_url": c.get("linkedin_url")
-        }
-        for c in companies
-    }
-
-    merged = []
-    for p in profiles:
-        company = p.get("company", "").strip()
-        details = company_map.get(company, {})
-        merged.append({
-            "query": p.get("query"),
-            "title": p.get("title"),
-            "url": p.get("url"),
-            "roles": p.get("roles"),
-            "company": company,
-            "company_website": details.get("company_website"),
-            "company_size": details.get("company_size"),
-            "company_linkedin_url": details.get("company_linkedin_url")
-        })
-
-    # Save JSON
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(merged, f, indent=2, ensure_ascii=False)
-
-    # Save CSV
-    df = pd.DataFrame(merged)
-    df.to_csv(OUTPUT_CSV, index=False, encoding="utf-8")
-
-    print(f"✅ Merged {len(merged)} profiles into '{OUTPUT_JSON}' and '{OUTPUT_CSV}'")
+    rows = merge()
+    outputs = ", ".join(f"'{p}'" for p in (OUTPUT_JSON, OUTPUT_CSV, OUTPUT_PARQUET) if p)
+    print(f"✅ Merged {rows} profiles into {outputs}")
 
 if __name__ == "__main__":
     main()
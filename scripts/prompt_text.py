@@ -0,0 +1,126 @@
+import functools
+import os
+import re
+from bs4 import BeautifulSoup, NavigableString
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Turns a company website into the few hundred tokens worth sending to the LLM:
+# boilerplate blocks are dropped, repeated strings deduped, and the remaining
+# text ranked so about/services copy wins when the token budget is tight.
+
+TOKENIZER_MODEL = "gpt-4o-mini"
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))  # website text tokens per company
+LEGACY_CHAR_LIMIT = 20000  # what fetch_website_text used to send
+
+BOILERPLATE_TAGS = ["script", "style", "noscript", "template", "svg", "iframe", "form", "nav", "footer", "aside"]
+# Only words that never name real content: "banner", "menu" or "modal" also show up in
+# hero sections and product blocks, which are often the best description of a company
+BOILERPLATE_HINTS = re.compile(r"cookie|consent|gdpr|newsletter|breadcrumb|navbar|skip-link", re.IGNORECASE)
+BOILERPLATE_ROLES = {"navigation", "contentinfo", "dialog", "alertdialog", "search"}  # whole ARIA role values
+RELEVANT_HINTS = re.compile(
+    r"about|who we are|what we do|service|solution|product|platform|industr|technolog|expertise|client|"
+    r"customer|founded|headquarter|employees|offices?\b|mission",
+    re.IGNORECASE
+)
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+MIN_WORDS = 4  # shorter fragments are mostly buttons and menu leftovers (headings excepted)
+
+@functools.lru_cache(maxsize=1)
+def encoder():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+    except Exception:
+        return None  # encoding files unavailable offline
+
+def tokenizer_name():
+    enc = encoder()
+    return enc.name if enc else "~4 chars/token estimate"
+
+def count_tokens(text):
+    enc = encoder()
+    if enc is None:
+        return (len(text) + 3) // 4
+    return len(enc.encode(text, disallowed_special=()))
+
+def legacy_website_text(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return " ".join(soup.stripped_strings)[:LEGACY_CHAR_LIMIT]
+
+def is_boilerplate(tag):
+    if tag.attrs is None:
+        return False
+    if (tag.get("role") or "").strip().lower() in BOILERPLATE_ROLES:
+        return True
+    hints = " ".join([tag.get("id") or "", " ".join(tag.get("class") or [])])
+    return bool(BOILERPLATE_HINTS.search(hints))
+
+def page_segments(html):
+    """(text, is_heading, section heading) for each visible, deduped text fragment in page order."""
+    soup = BeautifulSoup(html, "html.parser")
+    segments = []
+    seen = set()
+
+    def add(text, is_heading=False, heading=""):
+        text = " ".join(text.split())
+        key = text.lower()
+        if text and key not in seen:
+            seen.add(key)
+            segments.append((text, is_heading, heading))
+
+    if soup.title and soup.title.string:
+        add(soup.title.string, True)
+    for meta in soup.find_all("meta", attrs={"name": "description"}) + soup.find_all("meta", property="og:description"):
+        add(meta.get("content") or "", True)
+
+    for tag in soup.find_all(BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(is_boilerplate):
+        if not tag.decomposed:
+            tag.decompose()
+
+    body = soup.body or soup
+    heading = ""
+    for string in body.find_all(string=True):
+        if type(string) is not NavigableString or string.parent.name in ("title", "head"):
+            continue  # comments, doctype and head text
+        text = " ".join(string.split())
+        if not text:
+            continue
+        is_heading = string.find_parent(HEADING_TAGS) is not None
+        if is_heading:
+            heading = text
+        elif len(text.split()) < MIN_WORDS:
+            continue
+        add(text, is_heading, heading)
+    return segments
+
+def segment_score(index, total, text, is_heading, heading):
+    score = min(len(text.split()), 40) / 40
+    if RELEVANT_HINTS.search(text) or RELEVANT_HINTS.search(heading):
+        score += 2
+    if is_heading:
+        score += 1
+    return score - 0.5 * index / max(total, 1)  # earlier text breaks ties
+
+def extract_prompt_text(html, budget=PROMPT_TOKEN_BUDGET):
+    """Most relevant visible text of a page, in page order, within `budget` tokens."""
+    segments = page_segments(html)
+    ranked = sorted(
+        range(len(segments)),
+        key=lambda i: segment_score(i, len(segments), *segments[i]),
+        reverse=True
+    )
+    chosen = []
+    used = 0
+    for i in ranked:
+        tokens = count_tokens(segments[i][0]) + 1
+        if used + tokens <= budget:
+            chosen.append(i)
+            used += tokens
+    return " ".join(segments[i][0] for i in sorted(chosen))
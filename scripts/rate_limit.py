@@ -0,0 +1,69 @@
+import asyncio
+import random
+import time
+
+class TokenBucket:
+    """Async token bucket refilled at `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def retry_after_seconds(headers) -> float:
+    """Seconds requested by a Retry-After header, or 0 when absent/unparsable."""
+    try:
+        return max(0.0, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+class MinuteLimits:
+    """Requests- and tokens-per-minute buckets kept in step with x-ratelimit-* response headers."""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm / 60, rpm)
+        self.tokens = TokenBucket(tpm / 60, tpm)
+
+    async def acquire(self, tokens: float):
+        await self.requests.acquire()
+        await self.tokens.acquire(tokens)
+
+    def settle(self, estimated: float, used: float):
+        """Charge (or refund) the difference once the real token usage is known."""
+        self.tokens.tokens -= used - estimated
+
+    def observe(self, headers):
+        """Never run ahead of what the server says is left (or of a lower server-side limit)."""
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            try:
+                limit = float(headers.get(f"x-ratelimit-limit-{kind}"))
+                if limit < bucket.capacity:
+                    bucket.capacity, bucket.rate = limit, limit / 60
+            except (TypeError, ValueError):
+                pass
+            try:
+                remaining = float(headers.get(f"x-ratelimit-remaining-{kind}"))
+            except (TypeError, ValueError):
+                continue
+            bucket._refill()
+            bucket.tokens = min(bucket.tokens, remaining)
@@ -1,17 +1,61 @@
 import asyncio
-from playwright.async_api import async_playwright
+import collections
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import httpx
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import csv
 import re
 import urllib.parse
- 
+
+from naukri_parser import parse_listing_cards, parse_about_text, listing_has_no_results
+
+OUTPUT_CSV = "naukri_jobs.csv"
+CHECKPOINT_FILE = "naukri_checkpoint.json"  # removed once a run completes
+FIELDNAMES = ["title", "company", "location", "link"]
+
 SEARCH_QUERY = "Lead Generation"
 LOCATION = "India"
 MAX_PAGES = 50
+DETAIL_WORKERS = 8  # reusable tabs for job detail pages (4–16 works well)
+DETAIL_SETTLE_MS = 5000  # max wait for the about-company block to render
+LISTING_CONTEXTS = 4  # browser contexts crawling listing pages in parallel
+LISTING_PROCESSES = 1  # >1 splits the page range across that many Chromium processes
+LISTING_TIMEOUT_MS = 15000  # max wait for job cards (or the no-results marker) on a listing page
+SCROLL_SETTLE_MS = 1500  # after scrolling, max wait for lazy-loaded cards to appear
+LISTING_RETRIES = 2  # extra attempts for a listing page that timed out or could not be read
+BLOCK_RESOURCES = True  # abort images, media, fonts and trackers on every page
+BACKEND = "playwright"  # "http" fetches HTML over pooled httpx, using Chromium only for pages it can't parse
+HTTP_CONNECTIONS = 16  # pooled keep-alive connections for the http backend
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9"
+}
 
-COMPANY_SUFFIXES = ["Pvt Ltd", "Ltd", "Limited", "Services", "Solutions", 
+LISTING_SELECTOR = ".jobTuple, .cust-job-tuple"
+NO_RESULTS_SELECTOR = ".no-result-found, .noResultsFound, .nrf-container"  # mirrors NO_RESULTS_XPATH
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_URL_KEYWORDS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "adservice.google", "facebook.net", "connect.facebook",
+    "hotjar.com", "clarity.ms", "criteo", "taboola", "outbrain", "moengage", "bat.bing.com"
+]
+
+COMPANY_SUFFIXES = ["Pvt Ltd", "Ltd", "Limited", "Services", "Solutions",
                     "Technologies", "Group", "Enterprises", "India"]
 JUNK_COMPANY_KEYWORDS = ["Years", "Confidential", "Unknown"]
 
+ABOUT_SELECTORS = [
+    "section.about-company",
+    ".job-desc-about-company",
+    ".jd-header-comp-name",
+    "div.aboutCompany div:nth-child(1)"
+]
+
 def clean_company_name(name: str) -> str:
     if not name:
         return "Unknown"
@@ -35,94 +79,457 @@ def extract_company_from_link(link: str) -> str:
         return "Unknown"
     return "Unknown"
 
-async def scrape_naukri():
+def resolve_company(about_text: str, card_company: str, link: str) -> str:
+    """Pick the company from the detail page, falling back to the job card or URL."""
+    company = about_text.strip().split("\n")[0].strip() if about_text else ""
+    if not company or any(j.lower() in company.lower() for j in JUNK_COMPANY_KEYWORDS):
+        company = re.sub(r'(\d+|years|yrs|0 to \d+)', '', card_company, flags=re.I).strip()
+        if not company or any(j.lower() in company.lower() for j in JUNK_COMPANY_KEYWORDS):
+            company = extract_company_from_link(link)
+    return clean_company_name(company)
+
+async def block_heavy_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(k in request.url for k in BLOCKED_URL_KEYWORDS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def new_context(browser):
+    context = await browser.new_context()
+    if BLOCK_RESOURCES:
+        await context.route("**/*", block_heavy_resources)
+    return context
+
+async def extract_card(job) -> dict:
+    # Title and link
+    title_el = await job.query_selector("a.title")
+    title = await title_el.inner_text() if title_el else ""
+    link = await title_el.get_attribute("href") if title_el else ""
+
+    # Location
+    location_el = await job.query_selector(".locWdth, .location")
+    location = await location_el.inner_text() if location_el else ""
+
+    # Company as shown on the card (used only as a fallback)
+    company_el = await job.query_selector(".company a, .company span, .subTitle, .jd-header-comp-name")
+    card_company = await company_el.inner_text() if company_el else ""
+
+    return {"title": title, "link": link or "", "location": location, "card_company": card_company}
+
+async def fetch_about_text(page, link: str) -> str:
+    await page.goto(link, wait_until="domcontentloaded", timeout=30000)
+    try:
+        await page.wait_for_selector(", ".join(ABOUT_SELECTORS), timeout=DETAIL_SETTLE_MS)
+    except PlaywrightTimeoutError:
+        pass
+
+    about_text = ""
+    for sel in ABOUT_SELECTORS:
+        el = await page.query_selector(sel)
+        if el:
+            about_text = await el.inner_text()
+            if about_text.strip():
+                break
+    return about_text
+
+class DetailPool:
+    """Fixed set of reusable tabs that load job detail pages from a shared queue."""
+
+    def __init__(self, context, size: int, skip_links=frozenset()):
+        self.context = context
+        self.size = size
+        self.skip_links = skip_links  # already saved by an earlier run
+        self.queue = asyncio.Queue()
+        self.workers = []
+        self.futures = {}  # link -> detail text, so a repeated link is loaded once
+
+    async def start(self):
+        for _ in range(self.size):
+            page = await self.context.new_page()
+            self.workers.append(asyncio.create_task(self._work(page)))
+
+    async def _work(self, page):
+        while True:
+            link, future = await self.queue.get()
+            try:
+                if page.is_closed():
+                    page = await self.context.new_page()
+                about_text = await fetch_about_text(page, link)
+            except Exception as e:
+                print(f"⚠️ Could not load detail page {link}: {e}")
+                about_text = ""
+            if not future.done():
+                future.set_result(about_text)
+            self.queue.task_done()
+
+    def submit(self, link: str) -> asyncio.Future:
+        if link in self.futures:
+            return self.futures[link]
+        future = asyncio.get_running_loop().create_future()
+        if link and link not in self.skip_links:
+            self.queue.put_nowait((link, future))
+        else:
+            future.set_result("")
+        self.futures[link] = future
+        return future
+
+    async def close(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+
+def listing_url(page_number: int) -> str:
+    return f"https://www.naukri.com/{SEARCH_QUERY.lower().replace(' ','-')}-jobs-in-{LOCATION.lower()}-{page_number}"
+
+def build_rows(cards: list, about_texts: list) -> list:
+    """Turn job cards and their detail-page texts into CSV rows (shared by both backends)."""
+    rows = []
+    for card, about_text in zip(cards, about_texts):
+        rows.append({
+            "title": card["title"].strip(),
+            "company": resolve_company(about_text, card["card_company"], card["link"]).strip(),
+            "location": card["location"].strip(),
+            "link": card["link"]
+        })
+    return rows
+
+async def scroll_for_lazy_cards(page):
+    """Scroll to the bottom until the job card count stops growing (SCROLL_SETTLE_MS per round)."""
+    count = len(await page.query_selector_all(LISTING_SELECTOR))
+    while count:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            await page.wait_for_function(
+                "([selector, count]) => document.querySelectorAll(selector).length > count",
+                arg=[LISTING_SELECTOR, count],
+                timeout=SCROLL_SETTLE_MS
+            )
+        except PlaywrightTimeoutError:
+            return
+        count = len(await page.query_selector_all(LISTING_SELECTOR))
+
+async def scrape_listing_page(page, pool, page_number: int) -> list:
+    """Scrape one listing page; returns its rows in card order, [] once the results
+    have ended, or None when the page could not be read (the caller retries it)."""
+    url = listing_url(page_number)
+    print(f"🌐 Scraping page: {url}")
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+    except PlaywrightTimeoutError:
+        print(f"⚠️ Page {page_number} timed out.")
+        return None
+    try:
+        await page.wait_for_selector(f"{LISTING_SELECTOR}, {NO_RESULTS_SELECTOR}", timeout=LISTING_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass  # decided below from what did render
+    await scroll_for_lazy_cards(page)
+
+    jobs = await page.query_selector_all(LISTING_SELECTOR)
+    if not jobs:
+        if listing_has_no_results(await page.content(), page_number):
+            print(f"⚠️ No jobs found on page {page_number}.")
+            return []
+        print(f"⚠️ Page {page_number} showed neither job cards nor a no-results page.")
+        return None
+
+    cards = [await extract_card(job) for job in jobs]
+
+    # Detail pages load in parallel; gather keeps listing order
+    about_texts = await asyncio.gather(*(pool.submit(card["link"]) for card in cards))
+    return build_rows(cards, about_texts)
+
+async def run_listing_workers(page_numbers: list, scrapers: list, on_page):
+    """Run one worker per scraper callable over page_numbers, passing each page to on_page(page_number, rows).
+
+    Pages are handed out in ascending order and no page past the first empty one
+    is started, so the crawl stops shortly after the end of the results. A page
+    that could not be read (None) is retried LISTING_RETRIES times and then passed
+    on as None; it never counts as the end of the results.
+    """
+    pending = collections.deque(sorted(page_numbers))
+    first_empty = None
+
+    async def listing_worker(scrape_page):
+        nonlocal first_empty
+        while pending:
+            page_number = pending.popleft()
+            if first_empty is not None and page_number > first_empty:
+                break
+            rows = await scrape_page(page_number)
+            for _ in range(LISTING_RETRIES):
+                if rows is not None:
+                    break
+                print(f"🔁 Retrying page {page_number}")
+                rows = await scrape_page(page_number)
+            on_page(page_number, rows)
+            if rows == [] and (first_empty is None or page_number < first_empty):
+                first_empty = page_number
+
+    await asyncio.gather(*(listing_worker(scrape_page) for scrape_page in scrapers))
+
+async def crawl_pages(browser, page_numbers: list, on_page, skip_links=frozenset()):
+    """Crawl listing pages across LISTING_CONTEXTS browser contexts."""
+    detail_context = await new_context(browser)
+    pool = DetailPool(detail_context, DETAIL_WORKERS, skip_links)
+    await pool.start()
+
+    contexts = [await new_context(browser) for _ in range(LISTING_CONTEXTS)]
+    try:
+        pages = [await context.new_page() for context in contexts]
+        scrapers = [functools.partial(scrape_listing_page, page, pool) for page in pages]
+        await run_listing_workers(page_numbers, scrapers, on_page)
+    finally:
+        await pool.close()
+        for context in contexts + [detail_context]:
+            await context.close()
+
+async def crawl_in_browser(page_numbers: list, on_page, skip_links=frozenset()):
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
-        all_jobs = []
-
-        for page_number in range(1, MAX_PAGES + 1):
-            url = f"https://www.naukri.com/{SEARCH_QUERY.lower().replace(' ','-')}-jobs-in-{LOCATION.lower()}-{page_number}"
-            print(f"🌐 Scraping page: {url}")
-            await page.goto(url, wait_until="networkidle")
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)
-
-            jobs = await page.query_selector_all(".jobTuple, .cust-job-tuple")
-            if not jobs:
-                print(f"⚠️ No jobs found on page {page_number}.")
-                continue
-
-            for job in jobs:
-                # Title and link
-                title_el = await job.query_selector("a.title")
-                title = await title_el.inner_text() if title_el else ""
-                link = await title_el.get_attribute("href") if title_el else ""
-
-                # Location
-                location_el = await job.query_selector(".locWdth, .location")
-                location = await location_el.inner_text() if location_el else ""
-
-                # Company extraction
-                company = ""
-                if link:
-                    try:
-                        detail_page = await browser.new_page()
-                        await detail_page.goto(link, wait_until="domcontentloaded", timeout=30000)
-                        await asyncio.sleep(1)
-
-                        about_selectors = [
-                            "section.about-company",
-                            ".job-desc-about-company",
-                            ".jd-header-comp-name",
-                            "div.aboutCompany div:nth-child(1)"
-                        ]
-
-                        about_text = ""
-                        for sel in about_selectors:
-                            el = await detail_page.query_selector(sel)
-                            if el:
-                                about_text = await el.inner_text()
-                                if about_text.strip():
-                                    break
-
-                        if about_text:
-                            company_line = about_text.strip().split("\n")[0]
-                            company = company_line.strip()
-                        await detail_page.close()
-                    except Exception as e:
-                        print(f"⚠️ Could not load detail page {link}: {e}")
-
-                # Fallback to job card or URL
-                if not company or any(j.lower() in company.lower() for j in JUNK_COMPANY_KEYWORDS):
-                    company_el = await job.query_selector(".company a, .company span, .subTitle, .jd-header-comp-name")
-                    company = await company_el.inner_text() if company_el else ""
-                    company = re.sub(r'(\d+|years|yrs|0 to \d+)', '', company, flags=re.I).strip()
-                    if not company or any(j.lower() in company.lower() for j in JUNK_COMPANY_KEYWORDS):
-                        company = extract_company_from_link(link)
-
-                company = clean_company_name(company)
+        try:
+            await crawl_pages(browser, page_numbers, on_page, skip_links)
+        finally:
+            await browser.close()
+
+class BrowserFallback:
+    """Chromium launched on first use, for pages the http backend cannot parse."""
+
+    def __init__(self, skip_links=frozenset()):
+        self.skip_links = skip_links
+        self.lock = asyncio.Lock()
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.pool = None
+
+    async def _ensure_started(self):
+        async with self.lock:
+            if self.browser is None:
+                print("🧭 Starting browser fallback")
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=False)
+                self.context = await new_context(self.browser)
+                self.pool = DetailPool(self.context, DETAIL_WORKERS, self.skip_links)
+                await self.pool.start()
+
+    async def scrape_listing_page(self, page_number: int) -> list:
+        await self._ensure_started()
+        page = await self.context.new_page()
+        try:
+            return await scrape_listing_page(page, self.pool, page_number)
+        finally:
+            await page.close()
+
+    async def fetch_about_text(self, link: str) -> str:
+        await self._ensure_started()
+        return await self.pool.submit(link)
+
+    async def close(self):
+        if self.browser is not None:
+            await self.pool.close()
+            await self.browser.close()
+            await self.playwright.stop()
+
+async def fetch_about_text_http(client, fallback, link: str) -> str:
+    if not link:
+        return ""
+    try:
+        resp = await client.get(link)
+        resp.raise_for_status()
+        about_text = parse_about_text(resp.text)
+        if about_text.strip():
+            return about_text
+    except httpx.HTTPError as e:
+        print(f"⚠️ HTTP fetch failed for {link}: {e}")
+    return await fallback.fetch_about_text(link)
+
+class HttpDetailFetcher:
+    """DetailPool counterpart for the http backend; each distinct link is fetched once."""
+
+    def __init__(self, client, fallback, skip_links=frozenset()):
+        self.client = client
+        self.fallback = fallback
+        self.skip_links = skip_links
+        self.futures = {}
+
+    def submit(self, link: str) -> asyncio.Future:
+        if link not in self.futures:
+            target = "" if link in self.skip_links else link
+            self.futures[link] = asyncio.ensure_future(fetch_about_text_http(self.client, self.fallback, target))
+        return self.futures[link]
 
+async def scrape_listing_page_http(client, details, page_number: int) -> list:
+    """http-backend twin of scrape_listing_page; hands the page to Chromium only
+    when the HTML has no cards and is not a recognisable no-results page."""
+    url = listing_url(page_number)
+    print(f"🌐 Fetching page: {url}")
+    cards = []
+    try:
+        resp = await client.get(url)
+        if resp.status_code == 404:
+            print(f"⚠️ No jobs found on page {page_number}.")
+            return []
+        resp.raise_for_status()
+        cards = parse_listing_cards(resp.text)
+        if not cards and listing_has_no_results(resp.text, page_number):
+            print(f"⚠️ No jobs found on page {page_number}.")
+            return []
+    except httpx.HTTPError as e:
+        print(f"⚠️ HTTP fetch failed for page {page_number}: {e}")
+
+    if not cards:
+        return await details.fallback.scrape_listing_page(page_number)
+
+    about_texts = await asyncio.gather(*(details.submit(card["link"]) for card in cards))
+    return build_rows(cards, about_texts)
+
+async def crawl_over_http(page_numbers: list, on_page, skip_links=frozenset()):
+    limits = httpx.Limits(max_connections=HTTP_CONNECTIONS, max_keepalive_connections=HTTP_CONNECTIONS)
+    fallback = BrowserFallback(skip_links)
+    async with httpx.AsyncClient(headers=HTTP_HEADERS, limits=limits, timeout=30, follow_redirects=True) as client:
+        try:
+            details = HttpDetailFetcher(client, fallback, skip_links)
+            scrapers = [functools.partial(scrape_listing_page_http, client, details)] * LISTING_CONTEXTS
+            await run_listing_workers(page_numbers, scrapers, on_page)
+        finally:
+            await fallback.close()
+
+async def crawl(page_numbers: list, on_page, skip_links=frozenset()):
+    if BACKEND == "http":
+        await crawl_over_http(page_numbers, on_page, skip_links)
+    else:
+        await crawl_in_browser(page_numbers, on_page, skip_links)
+
+def crawl_shard(page_numbers: list, results, skip_links=frozenset()):
+    """Process entry point: crawl a shard with its own client/Chromium, sending pages to results."""
+    try:
+        asyncio.run(crawl(page_numbers, lambda page_number, rows: results.put((page_number, rows)), skip_links))
+    finally:
+        results.put(None)
+
+def load_checkpoint(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    # A checkpoint from a different search can't be resumed
+    if state.get("search") != listing_url(1):
+        return {}
+    return state
+
+class JobWriter:
+    """Streams rows to CSV in page order, flushing after every page.
+
+    Pages may finish out of order; they wait in `pending` until every earlier page
+    is written. Repeated links are dropped and nothing past the first empty page is kept.
+    After every page the writer state is saved to a checkpoint so an interrupted
+    run picks up where it stopped. A failed page (rows is None) holds back every
+    later page, which stay in the checkpoint until a rerun fetches it.
+    """
+
+    def __init__(self, path: str, checkpoint_path: str):
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        state = load_checkpoint(checkpoint_path)
+        self.pending = {int(n): rows for n, rows in state.get("pending_pages", {}).items()}
+        self.next_page = state.get("next_page", 1)
+        self.seen_links = set(state.get("seen_links", []))
+        self.count = state.get("rows_written", 0)
+        self.finished = False
+        self.failed = set()
+        self._open_output()
+
+    def _open_output(self):
+        # Keep only rows covered by the checkpoint; anything after it is rewritten on resume
+        rows = []
+        if self.count and os.path.exists(self.path):
+            with open(self.path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))[:self.count]
+        self.count = len(rows)
+        self.file = open(self.path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDNAMES)
+        self.writer.writeheader()
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def add_page(self, page_number: int, rows: list):
+        if self.finished:
+            return
+        if rows is None:
+            self.failed.add(page_number)
+            print(f"❌ Page {page_number} could not be read; run again to resume from it")
+            self.save_checkpoint()
+            return
+        self.pending[page_number] = rows
+        while self.next_page in self.pending:
+            rows = self.pending.pop(self.next_page)
+            if not rows:
+                self.finished = True
+                self.pending.clear()
+                break
+            for row in rows:
                 # Skip duplicates
-                if any(j["link"] == link for j in all_jobs):
+                if row["link"] in self.seen_links:
                     continue
+                self.seen_links.add(row["link"])
+                self.writer.writerow(row)
+                self.count += 1
+            self.file.flush()
+            self.next_page += 1
+        self.save_checkpoint()
+
+    def save_checkpoint(self):
+        state = {
+            "search": listing_url(1),
+            "next_page": self.next_page,
+            "rows_written": self.count,
+            "seen_links": sorted(self.seen_links),
+            "pending_pages": self.pending
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
 
-                all_jobs.append({
-                    "title": title.strip(),
-                    "company": company.strip(),
-                    "location": location.strip(),
-                    "link": link
-                })
+    def close(self):
+        self.file.close()
+        if (self.finished or self.next_page > MAX_PAGES) and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
 
-        await browser.close()
+async def scrape_naukri():
+    writer = JobWriter(OUTPUT_CSV, CHECKPOINT_FILE)
+    page_numbers = [n for n in range(writer.next_page, MAX_PAGES + 1) if n not in writer.pending]
+    skip_links = frozenset(writer.seen_links)
+    if writer.next_page > 1 or writer.pending:
+        print(f"♻️ Resuming from page {writer.next_page} ({writer.count} jobs already saved)")
 
-        # Save to CSV (without posted column)
-        with open("naukri_jobs.csv", "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["title","company","location","link"])
-            writer.writeheader()
-            writer.writerows(all_jobs)
+    try:
+        if LISTING_PROCESSES > 1:
+            # Interleaved shards so every process reaches the tail of the results together
+            shards = [page_numbers[i::LISTING_PROCESSES] for i in range(LISTING_PROCESSES)]
+            loop = asyncio.get_running_loop()
+            spawn = multiprocessing.get_context("spawn")
+            with spawn.Manager() as manager, \
+                 ProcessPoolExecutor(max_workers=LISTING_PROCESSES, mp_context=spawn) as executor:
+                results = manager.Queue()
+                runs = [loop.run_in_executor(executor, crawl_shard, shard, results, skip_links) for shard in shards]
+                running = len(runs)
+                while running:
+                    item = await loop.run_in_executor(None, results.get)
+                    if item is None:
+                        running -= 1
+                    else:
+                        writer.add_page(*item)
+                await asyncio.gather(*runs)
+        else:
+            await crawl(page_numbers, writer.add_page, skip_links)
+    finally:
+        writer.close()
 
-        print(f"✅ Saved {len(all_jobs)} jobs to CSV")
+    print(f"✅ Saved {writer.count} jobs to CSV")
+    if writer.failed and not writer.finished and writer.next_page <= MAX_PAGES:
+        print(f"⚠️ Stopped at page {writer.next_page}; {CHECKPOINT_FILE} is kept so the next run resumes there")
 
 if __name__ == "__main__":
     asyncio.run(scrape_naukri())
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+SEARCH_CACHE_FILE = os.getenv("SEARCH_CACHE_FILE", "serper_cache.sqlite")
+SEARCH_CACHE_TTL_DAYS = float(os.getenv("SEARCH_CACHE_TTL_DAYS", "30"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "200000"))
+EVICT_EVERY = 500  # writes between eviction sweeps
+
+def cache_key(payload: dict) -> str:
+    """Hash of the normalized query (case/whitespace-insensitive) plus the other search params."""
+    params = dict(payload)
+    query = " ".join(str(params.pop("q", "")).lower().split())
+    blob = json.dumps({"q": query, **params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class SearchCache:
+    """SQLite cache of search responses with TTL expiry and least-recently-used eviction."""
+
+    def __init__(self, path=SEARCH_CACHE_FILE, ttl_days=SEARCH_CACHE_TTL_DAYS, max_entries=SEARCH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS searches ("
+            "key TEXT PRIMARY KEY, payload TEXT, response TEXT, created REAL, accessed REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS searches_accessed ON searches(accessed)")
+
+    def get(self, payload: dict):
+        """Cached response for payload, or None when missing or expired."""
+        key = cache_key(payload)
+        row = self.db.execute("SELECT response, created FROM searches WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.ttl:
+            self.misses += 1
+            return None
+        self.db.execute("UPDATE searches SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, payload: dict, response: dict):
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO searches (key, payload, response, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (cache_key(payload), json.dumps(payload, ensure_ascii=False), json.dumps(response, ensure_ascii=False), now, now)
+        )
+        self.writes += 1
+        if self.writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries."""
+        self.db.execute("DELETE FROM searches WHERE created < ?", (time.time() - self.ttl,))
+        excess = self.db.execute("SELECT COUNT(*) FROM searches").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.db.execute(
+                "DELETE FROM searches WHERE key IN (SELECT key FROM searches ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+
+    def close(self):
+        self.evict()
+        self.db.close()
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import httpx
+from dotenv import load_dotenv
+
+from rate_limit import TokenBucket, backoff_delay, retry_after_seconds
+from search_cache import SearchCache, cache_key
+
+# Load environment variables
+load_dotenv()
+SERPER_KEY = os.getenv("SERPER_KEY")
+SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/search")  # override to hit a mock server
+SERPER_QPS = float(os.getenv("SERPER_QPS", "5"))  # queries per second allowed by your plan
+SERPER_CONCURRENCY = int(os.getenv("SERPER_CONCURRENCY", "10"))  # requests in flight
+USE_SEARCH_CACHE = os.getenv("USE_SEARCH_CACHE", "1") != "0"  # reuse stored results for repeated queries
+
+MAX_RETRIES = 4
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class SerperClient:
+    """Async Serper.dev client shared by the search scripts.
+
+    One keep-alive connection pool, a token bucket capped at SERPER_QPS and
+    retries with jittered backoff on 429/5xx and connection errors. Responses
+    are served from the on-disk SearchCache when available, and identical
+    queries in flight at the same time share one request.
+    """
+
+    def __init__(self, api_key=None, url=SERPER_URL, qps=SERPER_QPS, concurrency=SERPER_CONCURRENCY,
+                 use_cache=USE_SEARCH_CACHE, cache=None, transport=None):
+        self.url = url
+        self.bucket = TokenBucket(qps)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.cache = cache or (SearchCache() if use_cache else None)
+        self.inflight = {}
+        self.waiters = {}
+        self.calls = 0  # requests actually sent, retries included
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        headers = {"X-API-KEY": api_key or SERPER_KEY or "", "Content-Type": "application/json"}
+        self.http = httpx.AsyncClient(headers=headers, limits=limits, timeout=30, transport=transport)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.http.aclose()
+        if self.cache:
+            print(f"💾 Search cache: {self.cache.hits} hits, {self.cache.misses} misses, {self.calls} API calls")
+            self.cache.close()
+
+    async def search(self, payload: dict) -> dict:
+        """Search one payload; raises httpx.HTTPError once retries are exhausted."""
+        if self.cache:
+            cached = self.cache.get(payload)
+            if cached is not None:
+                return cached
+
+        key = cache_key(payload)
+        task = self.inflight.get(key)
+        owner = task is None
+        if owner:
+            task = self.inflight[key] = asyncio.ensure_future(self._fetch(payload))
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            data = await asyncio.shield(task)
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+                if not task.done():
+                    task.cancel()  # every caller gave up, e.g. a cancelled speculative search
+
+        if owner and self.cache:
+            self.cache.put(payload, data)
+        return data
+
+    async def _fetch(self, payload: dict) -> dict:
+        async with self.semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                await self.bucket.acquire()
+                self.calls += 1
+                try:
+                    response = await self.http.post(self.url, json=payload)
+                except httpx.TransportError:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+
+                if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    await asyncio.sleep(retry_after_seconds(response.headers) or backoff_delay(attempt))
+                    continue
+                response.raise_for_status()
+                try:
+                    return response.json()
+                except ValueError:
+                    # An HTML error page from a proxy or a truncated body: retry, then fail this query only
+                    if attempt == MAX_RETRIES:
+                        raise httpx.DecodingError("Serper response is not valid JSON", request=response.request)
+                    await asyncio.sleep(backoff_delay(attempt))
+
+    async def search_many(self, payloads: list) -> list:
+        """Run payloads concurrently; results (or the raised exception) come back in input order."""
+        return await asyncio.gather(*(self.search(p) for p in payloads), return_exceptions=True)
@@ -1,47 +1,81 @@
+import asyncio
+import json
 import os
+import httpx
 import pandas as pd
-import requests
-import json
-from time import sleep
-from dotenv import load_dotenv
+
+from company_resolver import CompanyIndex
+from serper_client import SerperClient
 
 # Files
 INPUT_CSV = "linkedin_profiles_cleaned.csv"
 INPUT_JSON = "company_linkedin_pages.json"
 OUTPUT_CSV = "linkedin_profiles_cleaned_updated.csv"
+RESOLUTION_REPORT = "company_resolution_unknown.json"  # fuzzy matches and ambiguous names to review
+PROGRESS_FILE = "unknown_companies_progress.jsonl"  # one line per searched (person, role), appended as they finish
 
-# Load Serper API key
-load_dotenv()
-SERPER_KEY = os.getenv("SERPER_KEY")
-HEADERS = {"X-API-KEY": SERPER_KEY}
+MISSING_WEBSITES = {"", "unknown"}
 
-# Load CSV
-df = pd.read_csv(INPUT_CSV)
+def load_companies(path=INPUT_JSON):
+    """Company table indexed by lowercased company_name, with website and company_size."""
+    with open(path, "r", encoding="utf-8") as f:
+        company_data = json.load(f)
+    rows = [
+        {
+            "name": str(comp["company_name"]).strip().lower(),
+            "website": comp.get("website") or "",
+            "company_size": comp.get("company_size") or ""
+        }
+        for comp in company_data
+        if comp.get("company_name")
+    ]
+    companies = pd.DataFrame(rows, columns=["name", "website", "company_size"], dtype=object)
+    return companies.drop_duplicates("name", keep="last").set_index("name")
 
-# Load JSON
-with open(INPUT_JSON, "r", encoding="utf-8") as f:
-    company_data = json.load(f)
+def text_column(df, column):
+    """Column as stripped strings, with NaN (or a missing column) as ""."""
+    if column not in df:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].fillna("").astype(str).str.strip()
 
-# Create lookup: company_name (lower) -> {website, company_size}
-company_lookup = {
-    str(comp.get("company_name", "")).strip().lower(): {
-        "website": comp.get("website", ""),
-        "company_size": comp.get("company_size", "")
+def fill_from_companies(df, companies, index):
+    """Pass 1: fill missing websites and every known company size from the company table."""
+    names = text_column(df, "company_name").str.lower()
+    # Each distinct name is resolved once: exact (lowercased) match first, then the fuzzy resolver
+    canonical = {
+        name: name if name in companies.index else None if name == "unknown" else index.resolve(name)
+        for name in names.unique()
     }
-    for comp in company_data
-    if comp.get("company_name")
-}
+    matched = companies.reindex(names.map(canonical))
+    matched.index = df.index
+
+    has_website = matched["website"].fillna("").astype(str).ne("")
+    needs_website = text_column(df, "company_website").str.lower().isin(MISSING_WEBSITES)
+    fill_website = has_website & needs_website
+    has_size = matched["company_size"].fillna("").astype(str).ne("")
+
+    for column in ("company_website", "company_size"):
+        if column not in df:
+            df[column] = ""
+    df["company_website"] = df["company_website"].astype(object).mask(fill_website, matched["website"])
+    df["company_size"] = df["company_size"].astype(object).mask(has_size, matched["company_size"])
+
+    filled = df.loc[fill_website, ["company_name", "company_website"]].drop_duplicates()
+    for name, website in filled.itertuples(index=False):
+        print(f"✅ Filled from JSON: {name} → {website}")
+    print(f"📋 Pass 1: {fill_website.sum()} websites and {has_size.sum()} company sizes filled")
+    return df
 
-def fetch_unknown_company_website(person_name, role):
-    """Fallback: Try to find company website for Unknown companies using person's name + role."""
+async def fetch_unknown_company_website(client, person_name, role):
+    """Fallback: Try to find company website for Unknown companies using person's name + role.
+
+    Returns None when the search itself failed, so a later run retries it.
+    """
     query = f"{person_name} {role} official company website"
-    url = "https://google.serper.dev/search"
     payload = {"q": query, "gl": "us", "hl": "en", "num": 5}
 
     try:
-        response = requests.post(url, headers=HEADERS, json=payload, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = await client.search(payload)
 
         if "organic" in data:
             for item in data["organic"]:
@@ -49,43 +83,98 @@ def fetch_unknown_company_website(person_name, role):
                 if link:
                     return link
         return ""
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"⚠️ Error fetching website for {person_name}: {e}")
-        return ""
+        return None
+
+async def fetch_unknown_websites(people, on_done):
+    """Search all (person_name, role) pairs concurrently under the client's rate limit."""
+    async with SerperClient() as client:
+        async def search(name, role):
+            website = await fetch_unknown_company_website(client, name, role)
+            if website is not None:
+                on_done(name, role, website)
+
+        await asyncio.gather(*(search(name, role) for name, role in people))
+
+def unknown_people(df):
+    """(person_name, role) for each row whose company is "Unknown"."""
+    unknown = text_column(df, "company_name").str.lower().eq("unknown")
+    person = text_column(df, "title").str.split("-").str[0].str.strip()
+    role = text_column(df, "roles")
+    return pd.DataFrame({"person": person, "role": role})[unknown]
+
+def load_progress(path=PROGRESS_FILE):
+    """{(person, role): website} already searched by an interrupted run."""
+    found = {}
+    if not os.path.exists(path):
+        return found
+    line = ""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            found[(record["person"], record["role"])] = record["website"]
+    if line and not line.endswith("\n"):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n")
+    return found
+
+def fill_unknown(df, progress_path=PROGRESS_FILE):
+    """Pass 2: search each distinct (person, role) among "Unknown" companies once.
+
+    Returns the number of searches that failed (and will be retried next run).
+    """
+    people = unknown_people(df)
+    keys = list(dict.fromkeys(zip(people["person"], people["role"])))
+    found = load_progress(progress_path)
+    pending = [key for key in keys if key not in found]
+    print(f"🔎 Pass 2: {len(people)} Unknown rows, {len(keys)} distinct people, "
+          f"{len(keys) - len(pending)} already in {progress_path}, {len(pending)} to search")
+
+    with open(progress_path, "a", encoding="utf-8") as progress:
+        def on_done(person, role, website):
+            found[(person, role)] = website
+            progress.write(json.dumps({"person": person, "role": role, "website": website}, ensure_ascii=False) + "\n")
+            progress.flush()
+
+        if pending:
+            asyncio.run(fetch_unknown_websites(pending, on_done))
+
+    websites = pd.Series([found.get(key, "") for key in zip(people["person"], people["role"])], index=people.index, dtype=object)
+    hit = websites.ne("")
+    df.loc[websites.index[hit], "company_website"] = websites[hit]
+
+    titles = text_column(df, "title")
+    for idx, website in websites.items():
+        if website:
+            print(f"🌍 Found via Google: {titles[idx]} → {website}")
+        else:
+            print(f"❌ Still unknown: {titles[idx]}")
+    return sum(key not in found for key in keys)
+
+def main(input_csv=INPUT_CSV, input_json=INPUT_JSON, output_csv=OUTPUT_CSV, progress_path=PROGRESS_FILE):
+    df = pd.read_csv(input_csv)
+    companies = load_companies(input_json)
+    company_index = CompanyIndex(companies.index)
+
+    # Pass 1: Fill from company_linkedin_pages.json
+    fill_from_companies(df, companies, company_index)
+    company_index.write_report(RESOLUTION_REPORT)
+
+    # Pass 2: Handle "Unknown" companies via Google search
+    failed = fill_unknown(df, progress_path)
 
-# Ensure company_size column exists
-if "company_size" not in df.columns:
-    df["company_size"] = ""
-
-# Pass 1: Fill from company_linkedin_pages.json
-for idx, row in df.iterrows():
-    company = str(row.get("company_name", "")).strip().lower()
-    if company in company_lookup:
-        info = company_lookup[company]
-        # Fill website if missing
-        if (not row.get("company_website")) or row["company_website"] in ["", "Unknown", "unknown"]:
-            if info["website"]:
-                df.at[idx, "company_website"] = info["website"]
-                print(f"✅ Filled from JSON: {row['company_name']} → {info['website']}")
-        # Always update company size
-        if info["company_size"]:
-            df.at[idx, "company_size"] = info["company_size"]
-
-# Pass 2: Handle "Unknown" companies via Google search
-unknown_rows = df[df["company_name"].str.lower() == "unknown"]
-
-for idx, row in unknown_rows.iterrows():
-    person_name = str(row["title"]).split("-")[0].strip()
-    role = row.get("roles", "")
-    website = fetch_unknown_company_website(person_name, role)
-    if website:
-        df.at[idx, "company_website"] = website
-        print(f"🌍 Found via Google: {row['title']} → {website}")
+    # Save full dataset
+    print(f"💾 Saving {len(df)} total rows (with websites + company size updated)...")
+    df.to_csv(output_csv, index=False)
+    print(f"✅ Updated dataset saved as {output_csv}")
+    if failed:
+        print(f"⚠️ {failed} searches failed; run again to retry them (finished ones are kept in {progress_path})")
     else:
-        print(f"❌ Still unknown: {row['title']}")
-    sleep(1)  # Avoid rate limiting
+        os.remove(progress_path)
 
-# Save full dataset
-print(f"💾 Saving {len(df)} total rows (with websites + company size updated)...")
-df.to_csv(OUTPUT_CSV, index=False)
-print(f"✅ Updated dataset saved as {OUTPUT_CSV}")
+if __name__ == "__main__":
+    main()
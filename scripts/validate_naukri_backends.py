@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import os
+import sys
+import httpx
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+import scrape_naukri
+from naukri_parser import parse_listing_cards, parse_about_text
+
+FIXTURE_DIR = "fixtures/naukri_backends"
+RECORD_PAGES = 3  # listing pages captured by `record`
+
+# Each URL is saved twice: the DOM Chromium rendered (replayed to the playwright
+# backend) and the raw server response httpx gets (what the http backend parses).
+
+def fixture_path(url: str, raw=False) -> str:
+    suffix = ".raw.html" if raw else ".html"
+    return os.path.join(FIXTURE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + suffix)
+
+def read_fixture(url: str, raw=False) -> str:
+    path = fixture_path(url, raw)
+    if not os.path.exists(path):
+        return ""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def write_fixture(url: str, html: str, raw=False):
+    with open(fixture_path(url, raw), "w", encoding="utf-8") as f:
+        f.write(html)
+
+async def record_raw(client, url: str) -> str:
+    """Server HTML as the http backend receives it."""
+    resp = await client.get(url)
+    write_fixture(url, resp.text, raw=True)
+    return resp.text
+
+async def record():
+    """Save rendered and raw listing and detail pages so both backends can be replayed offline."""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    async with async_playwright() as p, \
+               httpx.AsyncClient(headers=scrape_naukri.HTTP_HEADERS, timeout=30, follow_redirects=True) as client:
+        browser = await p.chromium.launch(headless=False)
+        page = await (await scrape_naukri.new_context(browser)).new_page()
+        for page_number in range(1, RECORD_PAGES + 1):
+            url = scrape_naukri.listing_url(page_number)
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector(scrape_naukri.LISTING_SELECTOR, timeout=scrape_naukri.LISTING_TIMEOUT_MS)
+            html = await page.content()
+            write_fixture(url, html)
+            raw = await record_raw(client, url)
+
+            links = dict.fromkeys(card["link"] for card in parse_listing_cards(html) + parse_listing_cards(raw))
+            for link in filter(None, links):
+                await page.goto(link, wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_selector(", ".join(scrape_naukri.ABOUT_SELECTORS), timeout=scrape_naukri.DETAIL_SETTLE_MS)
+                except PlaywrightTimeoutError:
+                    pass  # saved as is; fetch_about_text would give up at the same point
+                write_fixture(link, await page.content())
+                await record_raw(client, link)
+            print(f"💾 Recorded page {page_number}")
+        await browser.close()
+
+def http_rows(page_number: int) -> list:
+    """Rows the http backend's fast path gets from the raw server HTML (no browser fallback)."""
+    cards = parse_listing_cards(read_fixture(scrape_naukri.listing_url(page_number), raw=True))
+    return scrape_naukri.build_rows(cards, [parse_about_text(read_fixture(c["link"], raw=True)) for c in cards])
+
+async def browser_rows(page_numbers: list) -> dict:
+    async def serve_fixture(route):
+        html = read_fixture(route.request.url)
+        if html:
+            await route.fulfill(status=200, content_type="text/html", body=html)
+        else:
+            await route.abort()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context()
+        await context.route("**/*", serve_fixture)
+        pool = scrape_naukri.DetailPool(context, scrape_naukri.DETAIL_WORKERS)
+        await pool.start()
+        page = await context.new_page()
+        rows = {n: await scrape_naukri.scrape_listing_page(page, pool, n) for n in page_numbers}
+        await pool.close()
+        await browser.close()
+    return rows
+
+async def validate():
+    page_numbers = [n for n in range(1, RECORD_PAGES + 1)
+                    if os.path.exists(fixture_path(scrape_naukri.listing_url(n)))]
+    if not page_numbers:
+        print(f"❌ No fixtures in {FIXTURE_DIR}; run with `record` first")
+        return
+
+    expected = await browser_rows(page_numbers)
+    mismatches = 0
+    for n in page_numbers:
+        actual = http_rows(n)
+        for pw_row, http_row in zip(expected[n], actual):
+            if pw_row != http_row:
+                mismatches += 1
+                print(f"❌ Page {n}: playwright={pw_row} http={http_row}")
+        if len(expected[n]) != len(actual):
+            mismatches += 1
+            print(f"❌ Page {n}: {len(expected[n])} playwright rows vs {len(actual)} http rows")
+            if not actual:
+                print(f"   The raw HTML of page {n} has no job cards; the http backend would hand it to Chromium")
+
+    total = sum(len(rows) for rows in expected.values())
+    if mismatches:
+        print(f"⚠️ {mismatches} mismatches across {total} rows")
+    else:
+        print(f"✅ Backends agree on all {total} rows")
+
+if __name__ == "__main__":
+    asyncio.run(record() if sys.argv[1:] == ["record"] else validate())
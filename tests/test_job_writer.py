@@ -0,0 +1,88 @@
+import asyncio
+import csv
+import json
+import os
+
+import pytest
+
+import scrape_naukri
+
+LAST_PAGE_WITH_JOBS = 5
+
+def page_rows(page_number):
+    return [
+        {"title": f"Job {page_number}.{i}", "company": "Acme", "location": "Pune", "link": f"https://naukri.test/{page_number}/{i}"}
+        for i in range(2)
+    ]
+
+def stub_scraper(calls, failing=(), flaky=()):
+    """Listing scraper: pages up to LAST_PAGE_WITH_JOBS have rows, later ones are empty.
+
+    Pages in `failing` never load (None); pages in `flaky` fail on their first attempt only.
+    """
+    async def scrape(page_number):
+        calls.append(page_number)
+        await asyncio.sleep(0.001 * page_number)  # let pages finish out of order
+        if page_number in failing or (page_number in flaky and calls.count(page_number) == 1):
+            return None
+        return page_rows(page_number) if page_number <= LAST_PAGE_WITH_JOBS else []
+    return scrape
+
+def crawl(tmp_path, scraper, workers=2):
+    writer = scrape_naukri.JobWriter(str(tmp_path / "jobs.csv"), str(tmp_path / "checkpoint.json"))
+    page_numbers = [n for n in range(writer.next_page, scrape_naukri.MAX_PAGES + 1) if n not in writer.pending]
+    try:
+        asyncio.run(scrape_naukri.run_listing_workers(page_numbers, [scraper] * workers, writer.add_page))
+    finally:
+        writer.close()
+    return writer
+
+def csv_links(tmp_path):
+    with open(tmp_path / "jobs.csv", newline="", encoding="utf-8") as f:
+        return [row["link"] for row in csv.DictReader(f)]
+
+def expected_links(pages):
+    return [row["link"] for n in pages for row in page_rows(n)]
+
+@pytest.fixture(autouse=True)
+def small_crawl(monkeypatch):
+    monkeypatch.setattr(scrape_naukri, "MAX_PAGES", 10)
+
+def test_stops_at_first_empty_page(tmp_path):
+    calls = []
+    writer = crawl(tmp_path, stub_scraper(calls), workers=1)
+
+    assert writer.finished
+    assert max(calls) == LAST_PAGE_WITH_JOBS + 1  # nothing past the first empty page is started
+    assert csv_links(tmp_path) == expected_links(range(1, LAST_PAGE_WITH_JOBS + 1))
+    assert not os.path.exists(tmp_path / "checkpoint.json")
+
+def test_flaky_page_is_retried(tmp_path):
+    calls = []
+    writer = crawl(tmp_path, stub_scraper(calls, flaky={2}))
+
+    assert calls.count(2) == 2
+    assert writer.finished and not writer.failed
+    assert csv_links(tmp_path) == expected_links(range(1, LAST_PAGE_WITH_JOBS + 1))
+    assert not os.path.exists(tmp_path / "checkpoint.json")
+
+def test_failed_page_keeps_checkpoint_and_rerun_resumes(tmp_path):
+    calls = []
+    writer = crawl(tmp_path, stub_scraper(calls, failing={3}))
+
+    # Page 3 is retried, never taken as the end of the results, and holds back later pages
+    assert calls.count(3) == 1 + scrape_naukri.LISTING_RETRIES
+    assert writer.failed == {3} and not writer.finished
+    assert csv_links(tmp_path) == expected_links([1, 2])
+    with open(tmp_path / "checkpoint.json", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["next_page"] == 3
+    assert {4, 5} <= {int(n) for n in state["pending_pages"]}
+
+    calls = []
+    writer = crawl(tmp_path, stub_scraper(calls))
+
+    assert 3 in calls and not {1, 2, 4, 5} & set(calls)  # only what the checkpoint didn't hold
+    assert writer.finished
+    assert csv_links(tmp_path) == expected_links(range(1, LAST_PAGE_WITH_JOBS + 1))
+    assert not os.path.exists(tmp_path / "checkpoint.json")
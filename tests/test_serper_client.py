@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import serper_client
+from serper_client import SerperClient
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(serper_client, "backoff_delay", lambda attempt: 0)
+
+class MockSerper:
+    """httpx.MockTransport handler that replays queued responses per query, then answers normally."""
+
+    def __init__(self, script=None, delay=0):
+        self.script = {q: list(responses) for q, responses in (script or {}).items()}
+        self.delay = delay
+        self.requests = []
+
+    async def __call__(self, request):
+        query = json.loads(request.content)["q"]
+        self.requests.append(query)
+        await asyncio.sleep(self.delay)
+        queued = self.script.get(query)
+        if queued:
+            return queued.pop(0)
+        return httpx.Response(200, json={"organic": [{"link": f"https://{query}.example"}]})
+
+def search_all(mock, queries):
+    async def run():
+        async with SerperClient(api_key="test", qps=1000, use_cache=False, transport=httpx.MockTransport(mock)) as client:
+            return await client.search_many([{"q": q} for q in queries])
+    return asyncio.run(run())
+
+def test_identical_inflight_queries_share_one_request():
+    mock = MockSerper(delay=0.05)
+    results = search_all(mock, ["acme", "acme", "acme", "beta"])
+
+    assert sorted(mock.requests) == ["acme", "beta"]
+    assert results[0] == results[1] == results[2] == {"organic": [{"link": "https://acme.example"}]}
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retryable_statuses_are_retried(status):
+    mock = MockSerper({"acme": [httpx.Response(status, headers={"retry-after": "0"}), httpx.Response(status)]})
+    [result] = search_all(mock, ["acme"])
+
+    assert mock.requests == ["acme"] * 3
+    assert result == {"organic": [{"link": "https://acme.example"}]}
+
+def test_client_errors_are_not_retried():
+    mock = MockSerper({"acme": [httpx.Response(400)]})
+    [result] = search_all(mock, ["acme"])
+
+    assert mock.requests == ["acme"]
+    assert isinstance(result, httpx.HTTPStatusError)
+
+def test_non_json_body_is_retried_then_fails_only_that_query():
+    html = httpx.Response(200, text="<html>proxy error</html>")
+    mock = MockSerper({"acme": [html] * (serper_client.MAX_RETRIES + 1), "beta": [html]})
+    acme, beta = search_all(mock, ["acme", "beta"])
+
+    assert isinstance(acme, httpx.DecodingError)
+    assert mock.requests.count("acme") == serper_client.MAX_RETRIES + 1
+    assert beta == {"organic": [{"link": "https://beta.example"}]}  # one bad body, recovered on retry